@@ -1,12 +1,28 @@
 import os
-import cloudinary
-import cloudinary.uploader
-from dotenv import load_dotenv
+from concurrent.futures import ThreadPoolExecutor
+from config.env_cache import fast_load_dotenv
 from config.logging_config import AppLogger
 
 logger = AppLogger.get_logger(__name__)
 
-load_dotenv()
+fast_load_dotenv()
+
+# Shared worker pool for Cloudinary uploads - created on first use so
+# importing this module never spawns threads
+_upload_pool = None
+
+def get_upload_pool():
+    """
+    Lazily create the background upload pool (4 workers is plenty for
+    the barcode-image workload)
+    """
+    global _upload_pool
+    if _upload_pool is None:
+        _upload_pool = ThreadPoolExecutor(
+            max_workers=4,
+            thread_name_prefix='cloudinary-upload'
+        )
+    return _upload_pool
 
 def init_cloudinary():
     """
@@ -14,6 +30,8 @@ def init_cloudinary():
     Raises:
         ValueError: If required Cloudinary credentials are missing
     """
+    import cloudinary
+
     cloud_name = os.getenv("CLOUDINARY_CLOUD_NAME")
     api_key = os.getenv("CLOUDINARY_API_KEY")
     api_secret = os.getenv("CLOUDINARY_API_SECRET")
@@ -37,51 +55,110 @@ def init_cloudinary():
     print("API key:", os.getenv("CLOUDINARY_API_KEY"), flush=True)
 
 
-def upload_to_cloudinary(file_path, public_id, folder="grocery_barcodes"):
+def upload_to_cloudinary(file_path=None, public_id=None, folder="grocery_barcodes",
+                         file_obj=None):
     """
     Upload image to Cloudinary
-    
+
     Args:
         file_path: Local file path to upload
         public_id: Unique identifier (barcode number)
         folder: Folder name in Cloudinary
-    
+        file_obj: In-memory file-like object (e.g. BytesIO) to upload
+                  instead of a path - skips the disk round trip entirely
+
     Returns:
         dict: Upload result with secure_url and other metadata
-    
+
     Raises:
         FileNotFoundError: If file_path doesn't exist
         Exception: If Cloudinary upload fails
     """
-    if not os.path.exists(file_path):
-        error_msg = f"File not found for upload: {file_path}"
-        logger.error(error_msg)
-        raise FileNotFoundError(error_msg)
-    
+    import cloudinary.uploader
+
     try:
-        logger.debug(f"Uploading file to Cloudinary: {file_path}")
-        result = cloudinary.uploader.upload(
-            file_path,
-            public_id=public_id,
-            folder=folder,
-            resource_type="image",
-            overwrite=True
-        )
-        logger.info(f"Image uploaded successfully: {result['secure_url']}")
+        if file_obj is not None:
+            # the SDK accepts file-like objects natively; no temp file,
+            # no write+read back from disk
+            logger.debug("Uploading in-memory buffer to Cloudinary: %s", public_id)
+            result = cloudinary.uploader.upload(
+                file_obj,
+                public_id=public_id,
+                folder=folder,
+                resource_type="image",
+                overwrite=True
+            )
+        else:
+            if not os.path.exists(file_path):
+                error_msg = f"File not found for upload: {file_path}"
+                logger.error(error_msg)
+                raise FileNotFoundError(error_msg)
+
+            logger.debug("Uploading file to Cloudinary: %s", file_path)
+            # upload_large streams the file in chunks instead of reading
+            # it fully into memory - same result shape as uploader.upload
+            result = cloudinary.uploader.upload_large(
+                file_path,
+                public_id=public_id,
+                folder=folder,
+                resource_type="image",
+                overwrite=True,
+                chunk_size=6 * 1024 * 1024
+            )
+        logger.info("Image uploaded successfully: %s", result['secure_url'])
         return result
+    except FileNotFoundError:
+        raise
     except Exception as e:
         error_msg = f"Cloudinary upload error: {str(e)}"
         logger.error(error_msg)
         raise Exception(error_msg) from e
 
+def upload_to_cloudinary_async(file_path, public_id, folder="grocery_barcodes",
+                               cleanup=False):
+    """
+    Submit a Cloudinary upload to the background pool and return a Future
+
+    The HTTPS round-trip (typically hundreds of ms) happens on a worker
+    thread instead of blocking the request handler
+
+    Args:
+        file_path: Local file path to upload
+        public_id: Unique identifier (barcode number)
+        folder: Folder name in Cloudinary
+        cleanup: If True, delete file_path after the upload finishes
+
+    Returns:
+        concurrent.futures.Future resolving to the upload result dict
+    """
+    def _task():
+        try:
+            return upload_to_cloudinary(file_path, public_id, folder)
+        finally:
+            if cleanup:
+                # no exists() probe first - unlink and let a missing
+                # file fall through, one syscall instead of two
+                try:
+                    os.remove(file_path)
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    logger.warning('Could not remove uploaded temp file %s: %s',
+                                   file_path, e)
+
+    return get_upload_pool().submit(_task)
+
+
 def delete_from_cloudinary(public_id, folder="grocery_barcodes"):
     """Delete image from Cloudinary"""
+    import cloudinary.uploader
+
     try:
         full_public_id = f"{folder}/barcode_{public_id}"
         result = cloudinary.uploader.destroy(full_public_id)
-        logger.info(f"Image deleted: {public_id}")
+        logger.info("Image deleted: %s", public_id)
         return result
 
     except Exception as e:
-        logger.error(f"Cloudinary delete error: {str(e)}")
+        logger.error("Cloudinary delete error: %s", e)
         raise
\ No newline at end of file
@@ -1,5 +1,6 @@
 from flask_sqlalchemy import SQLAlchemy
 from config.logging_config import AppLogger
+import os
 # create database instance
 # It will be used in all models
 
@@ -17,19 +18,42 @@ def init_db(app):
     logger.info("Initializing Database Connection . . .")
     logger.info("-"*30)
     try:
+        # Tune the connection pool before binding the app:
+        # pool_pre_ping transparently replaces connections killed by
+        # MySQL wait_timeout, pool_recycle keeps connections younger
+        # than the server-side timeout
+        app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', {}).update({
+            'pool_pre_ping': True,
+            'pool_recycle': 280,
+            'pool_size': int(os.getenv('DB_POOL_SIZE', 10)),
+            'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', 20)),
+            'pool_timeout': 30
+        })
+
         db.init_app(app) # initializes database with current app
-        with app.app_context(): 
+        with app.app_context():
         # import all models here so they are registered with SQLAlchemy
             from models import user, category, supplier, product, transaction
             logger.info("Models imported Successfully !")
 
-            db.create_all()
-            logger.info("Database tables created successfully!")
+            # create_all() introspects the schema on every boot, which is
+            # wasted round-trips once the tables exist. Run it on the first
+            # boot (no sentinel yet) or when RUN_DB_BOOTSTRAP=1 forces it
+            # (e.g. after adding a model); warm restarts skip it entirely.
+            sentinel = os.path.join(os.path.dirname(__file__), '.db_initialized')
+            if os.getenv('RUN_DB_BOOTSTRAP') == '1' or not os.path.exists(sentinel):
+                db.create_all()
+                logger.info("Database tables created successfully!")
+
+                with open(sentinel, 'w') as marker:
+                    marker.write('ok')
+            else:
+                logger.info("Schema bootstrap skipped (already initialized)")
 
             table_names = db.metadata.tables.keys()
-            logger.info(f'Active tables: {", ".join(table_names)}')
+            logger.info('Active tables: %s', ', '.join(table_names))
 
     except Exception as e:
-        logger.critical(f'Database initialization failed : {str(e)}')
+        logger.critical('Database initialization failed : %s', e)
 
         raise # re-raisinf exception so that the db doesn't start with broken db
\ No newline at end of file
@@ -0,0 +1,51 @@
+"""
+Cached .env loading
+Parsing .env with python-dotenv costs tens of ms on every boot/reload;
+cache the parsed dict keyed on the file's mtime so warm starts load it
+in a single pickle read
+"""
+
+import os
+import pickle
+from config.logging_config import AppLogger
+
+logger = AppLogger.get_logger(__name__)
+
+
+def fast_load_dotenv(path='.env'):
+    """
+    Load environment variables from .env, using a pickle cache when the
+    file has not changed since the last parse
+
+    Args:
+        path: Path to the .env file (default: '.env')
+    """
+    if not os.path.exists(path):
+        return
+
+    cache_path = path + '.cache.pkl'
+    mtime = os.stat(path).st_mtime
+
+    # try the cache first
+    try:
+        with open(cache_path, 'rb') as f:
+            cached = pickle.load(f)
+        if cached.get('mtime') == mtime:
+            for key, value in cached['values'].items():
+                os.environ.setdefault(key, value)
+            return
+    except (OSError, pickle.PickleError, EOFError, KeyError):
+        pass  # stale or missing cache - fall through to a full parse
+
+    # full parse, then refresh the cache
+    from dotenv import dotenv_values
+    values = {k: v for k, v in dotenv_values(path).items() if v is not None}
+
+    for key, value in values.items():
+        os.environ.setdefault(key, value)
+
+    try:
+        with open(cache_path, 'wb') as f:
+            pickle.dump({'mtime': mtime, 'values': values}, f)
+    except OSError as e:
+        logger.warning('Could not write .env cache: %s', e)
@@ -1,27 +1,99 @@
+import atexit
+import functools
 import logging
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 import os
+import queue
+
+class FastFormatter(logging.Formatter):
+    """
+    Formatter that renders %(asctime)s as integer epoch milliseconds
+    formatTime's strftime path is the most expensive part of record
+    formatting, which adds up on high-volume logs
+    """
+
+    def formatTime(self, record, datefmt=None):
+        return str(int(record.created * 1000))
+
 
 class AppLogger:
 
+    LOG_DIR = "logs"
+    LOG_FORMAT = '%(asctime)s - %(levelname)s - %(name)s - %(message)s'
+
+    # module name (last segment) -> dedicated log file
+    LOG_FILES = {
+        'auth_routes': 'auth.log',
+        'product_routes': 'products.log',
+        'supplier_routes': 'supplier.log',
+        'transaction_routes': 'transaction.log',
+        'barcode_routes': 'barcode.log',
+        'barcode_generator': 'barcode.log',
+        'category_routes': 'category.log',
+    }
+
+    # high-volume logs trade human-readable timestamps for epoch ms
+    FAST_TIME_FILES = {'transaction.log', 'barcode.log'}
+
+    @staticmethod
+    def _non_blocking(handler):
+        """
+        Put a queue in front of a file handler so request threads only
+        enqueue records; a background listener thread does the disk writes
+        """
+        log_queue = queue.Queue(-1)
+        listener = QueueListener(log_queue, handler, respect_handler_level=True)
+        listener.start()
+        atexit.register(listener.stop)
+        return QueueHandler(log_queue)
+
     @staticmethod
     def set_up():
-        log_dir = "logs"
+        log_dir = AppLogger.LOG_DIR
 
         if(not os.path.exists(log_dir)):
             os.makedirs(log_dir, exist_ok=True)
 
+        root = logging.getLogger()
+        if root.handlers:   # already configured (e.g. reloader child)
+            return
+
         log_file = os.path.join(log_dir, "app.log")
         level = logging.DEBUG if os.getenv('FLASK_ENV') == 'DEVELOPMENT' else logging.INFO
 
-        logging.basicConfig(
-                filename=log_file,
-                level=level,
-                format='%(asctime)s - %(levelname)s - %(name)s - %(message)s',
-                filemode='w' 
+        file_handler = logging.FileHandler(log_file, mode='w')
+        file_handler.setFormatter(logging.Formatter(AppLogger.LOG_FORMAT))
+
+        root.setLevel(level)
+        root.addHandler(AppLogger._non_blocking(file_handler))
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _make_logger(name, filename):
+        """
+        Build a logger with its dedicated file handler exactly once
+        lru_cache guarantees single construction, so there is no need
+        to scan logger.handlers for duplicates on every call
+        """
+        logger = logging.getLogger(name)
+
+        if filename:
+            os.makedirs(AppLogger.LOG_DIR, exist_ok=True)
+            handler = RotatingFileHandler(
+                os.path.join(AppLogger.LOG_DIR, filename),
+                maxBytes=1_000_000,
+                backupCount=3,
+                delay=True  # don't open the file descriptor until first write
             )
-        
+            formatter_cls = (FastFormatter if filename in AppLogger.FAST_TIME_FILES
+                             else logging.Formatter)
+            handler.setFormatter(formatter_cls(AppLogger.LOG_FORMAT))
+            logger.addHandler(AppLogger._non_blocking(handler))
+
+        return logger
+
     @staticmethod
+    @functools.lru_cache(maxsize=None)
     def get_logger(name=__name__):
-        return logging.getLogger(name)
-
-        
+        filename = AppLogger.LOG_FILES.get(name.rsplit('.', 1)[-1])
+        return AppLogger._make_logger(name, filename)
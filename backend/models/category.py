@@ -15,7 +15,16 @@ class Category(db.Model):
     # category info
     name = db.Column(db.String(100), unique=True, nullable=False, index=True )
     description = db.Column(db.Text(), nullable=True)
-    products = db.relationship('Product', backref='category', lazy=True, cascade= 'all, delete-orphan')
+    # lazy='dynamic' keeps .products as a query, so iterating a list of
+    # categories never triggers a per-category SELECT of full product rows
+    products = db.relationship('Product', backref='category', lazy='dynamic', cascade= 'all, delete-orphan')
+
+    def product_count(self):
+        """
+        Count products via SQL instead of hydrating every product row
+        in the category just to count them
+        """
+        return self.products.count()
 
     def to_dict(self):
         """
@@ -27,5 +36,5 @@ class Category(db.Model):
             'id' : self.id,
             'name' : self.name,
             'description' : self.description if self.description else None,
-            'product_count' : len(self.products)  # total products in this category
+            'product_count' : self.product_count()  # total products in this category
         }
@@ -1,5 +1,37 @@
+from flask import g, has_request_context
 from config.database import db
-from datetime import datetime
+from datetime import date
+from sqlalchemy import and_, func
+from sqlalchemy.ext.hybrid import hybrid_method, hybrid_property
+
+
+def _request_today():
+    """
+    Today's date, read once per request
+
+    date.today() is a clock syscall; callers that serialize many
+    products without passing an explicit today (single-object
+    responses, is_expired/days_left_to_expire) would otherwise hit it
+    per call. The first read in a request is cached on flask.g; outside
+    a request context (scripts, background workers) it falls back to a
+    plain clock read
+    """
+    if not has_request_context():
+        return date.today()
+    today = getattr(g, '_today', None)
+    if today is None:
+        g._today = today = date.today()
+    return today
+
+# to_dict keys hoisted to module scope: rebuilding the dict literal
+# re-hashes the same string keys on every call, which is measurable when
+# serializing thousand-product pages; zip against a value tuple reuses
+# the interned keys
+_PRODUCT_KEYS = (
+    'id', 'name', 'sku', 'barcode', 'price', 'quantity', 'expiry_date',
+    'days_left_to_expire', 'is_expired', 'is_low_stock', 'created_at',
+    'updated_at',
+)
 
 
 class Product(db.Model):
@@ -9,7 +41,19 @@ class Product(db.Model):
     """
 
     __tablename__ = 'products'
-    
+
+    # composite indexes matching the real access patterns:
+    # low-stock by category, expiring-soon by supplier. Their leading
+    # columns also cover the plain category/supplier filters; the global
+    # expiring/low-stock endpoints get their own single-column indexes
+    # so those range scans don't walk the whole table
+    __table_args__ = (
+        db.Index('ix_products_cat_qty', 'category_id', 'quantity'),
+        db.Index('ix_products_sup_exp', 'supplier_id', 'expiry_date'),
+        db.Index('ix_products_expiry', 'expiry_date'),
+        db.Index('ix_products_quantity', 'quantity'),
+    )
+
 
     # primary key
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
@@ -18,86 +62,122 @@ class Product(db.Model):
     name = db.Column(db.String(200), nullable=False, index=True)
     sku = db.Column(db.String(50), unique=True, nullable=False, index=True) # stock keeping unit
     barcode = db.Column(db.String(100), unique=True, nullable=True, index=True)
-    price = db.Column(db.Numeric(10,2), nullable=False)  # upto 99,999,999.99
+    # price stored as integer cents: ints are cheaper than Decimal to
+    # hydrate and aggregate, and to_dict converted to float anyway
+    price_cents = db.Column(db.BigInteger, nullable=False)
     quantity = db.Column(db.Integer, default=0, nullable=False)
     expiry_date = db.Column(db.Date, nullable=True)  # for perishable item
     
     # foreign keys
     category_id = db.Column(db.Integer, db.ForeignKey('categories.id'), nullable=False)
-    supplier_id = db.Column(db.Integer, db.ForeignKey('suppliers.id'), nullable= False)
+    supplier_id = db.Column(db.Integer, db.ForeignKey('suppliers.id', ondelete='CASCADE'), nullable= False)
 
-    # Timestamps
-    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    # Timestamps - generated DB-side: no Python clock call per row, and
+    # bulk inserts can omit the columns entirely
+    created_at = db.Column(db.DateTime, server_default=func.now(), nullable=False)
+    updated_at = db.Column(db.DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
 
-    transactions = db.relationship('Transaction', backref='product', lazy = True, cascade='all, delete-orphan')
+    # passive_deletes: trust the FK's ON DELETE CASCADE instead of
+    # loading every child transaction into the session just to delete it
+    transactions = db.relationship('Transaction', backref='product', lazy = True,
+                                   cascade='all, delete-orphan', passive_deletes=True)
 
-    def is_expired(self):
+    @hybrid_property
+    def price(self):
         """
-        Checks if product has expired
+        Price in currency units (back-compat view over price_cents)
+        """
+        return self.price_cents / 100 if self.price_cents is not None else None
+
+    @price.setter
+    def price(self, value):
+        self.price_cents = int(round(float(value) * 100))
 
+    @price.expression
+    def price(cls):
+        return cls.price_cents / 100.0
+
+    def _expiry_status(self, today):
+        """
+        Compute (is_expired, days_left) against a caller-supplied date,
+        so bulk serialization reads the clock once instead of per product
         """
         if not self.expiry_date:
-            return False   # No expiry date means non perishable
-        
-        is_exp = self.expiry_date < datetime.now().date()
+            return False, None   # No expiry date means non perishable
+
+        # ordinal subtraction is plain int math - no timedelta object
+        # allocated per row when serializing large pages
+        delta = self.expiry_date.toordinal() - today.toordinal()
+
+        return delta < 0, delta
+
+    @hybrid_method
+    def is_expired(self):
+        """
+        Checks if product has expired
+        Usable in queries too: Product.query.filter(Product.is_expired())
+        pushes the comparison into SQL instead of fetching rows to check
+        in Python
+        """
+        return self._expiry_status(_request_today())[0]
+
+    @is_expired.expression
+    def is_expired(cls):
+        return and_(cls.expiry_date.isnot(None), cls.expiry_date < func.current_date())
 
-        return is_exp
-    
     def days_left_to_expire(self):
         """
         Calculate days remaining until expiry
-        Returns: 
+        Returns:
             - Number of days (positive = future, negative = past)
             - None if no expiry date
         """
-
-        if not self.expiry_date:
-            return None
-        
-        today = datetime.now().date()
-        delta = (self.expiry_date - today).days
-
-        # Log warning for product expiring within 1 week ... 
-        if 0 < delta <= 7:
-            pass
-
-        return delta
+        return self._expiry_status(_request_today())[1]
     
+    @hybrid_method
     def is_low_stock(self, threshold=10):
         """
         Check if product quantity is low
-        
+        Also usable as a SQL predicate:
+        Product.query.filter(Product.is_low_stock(threshold))
+
         Args:
             - threshold : Minimum quantity required(default = 10)
         """
+        return self.quantity <= threshold
 
-        is_low = self.quantity <= threshold
-        if is_low:
-            pass
-
-        return is_low
+    @is_low_stock.expression
+    def is_low_stock(cls, threshold=10):
+        return cls.quantity <= threshold
     
-    def to_dict(self, include_relations=False):
+    def to_dict(self, include_relations=False, today=None):
         """
         Convert Product object to dictionary
         Args:
             include_relations: If true, includes category and supplier details
+            today: Reference date for expiry fields; list endpoints pass
+                   one date for the whole page instead of reading the
+                   clock per product
         """
-        base_dict = {
-            'id':self.id,
-            'name': self.name,
-            'sku': self.sku,
-            'barcode':self.barcode,
-            'price': float(self.price) if self.price else 0.0,
-            'quantity':self.quantity,
-            'expiry_date':self.expiry_date.isoformat() if self.expiry_date else None,
-            'days_left_to_expire': self.days_left_to_expire(),
-            'is_expired': self.is_expired(),
-            'is_low_stock': self.is_low_stock(),
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at':self.updated_at.isoformat() if self.updated_at else None
-        }
+        if today is None:
+            today = _request_today()
+
+        is_expired, days_left = self._expiry_status(today)
+
+        base_dict = dict(zip(_PRODUCT_KEYS, (
+            self.id,
+            self.name,
+            self.sku,
+            self.barcode,
+            float(self.price) if self.price else 0.0,
+            self.quantity,
+            self.expiry_date.isoformat() if self.expiry_date else None,
+            days_left,
+            is_expired,
+            self.is_low_stock(),
+            self.created_at.isoformat() if self.created_at else None,
+            self.updated_at.isoformat() if self.updated_at else None,
+        )))
 
         # Include related objects if requested
         if include_relations:
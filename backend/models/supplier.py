@@ -1,6 +1,6 @@
 
 from config.database import db
-from datetime import datetime
+from sqlalchemy import func
 
 class Supplier(db.Model):
     """
@@ -18,9 +18,15 @@ class Supplier(db.Model):
     name = db.Column(db.String(100), unique=True, nullable=False, index=True)
     contact = db.Column(db.String(15), nullable=False)
     email = db.Column(db.String(120), nullable=True, index=True)
-    address = db.Column(db.Text(), nullable=True)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
-    products = db.relationship('Product', backref='supplier', lazy=True, cascade='all, delete-orphan')
+    # deferred: the Text blob isn't fetched unless actually accessed
+    address = db.deferred(db.Column(db.Text(), nullable=True))
+    created_at = db.Column(db.DateTime, server_default=func.now(), nullable=False)
+    # lazy='dynamic' keeps .products as a query so counting never
+    # hydrates full product rows (the N+1 in supplier listings);
+    # passive_deletes trusts the FK's ON DELETE CASCADE so deleting a
+    # supplier never iterates its product collection
+    products = db.relationship('Product', backref='supplier', lazy='dynamic',
+                               cascade='all, delete-orphan', passive_deletes=True)
 
     def to_dict(self):
         """
@@ -33,5 +39,5 @@ class Supplier(db.Model):
             'email' : self.email if self.email else None,
             'address' : self.address if self.address else None,
             'created_at' : self.created_at if self.created_at else None,
-            'product_count' : len(self.products)   # total products from this supplier
+            'product_count' : self.products.count()   # total products from this supplier (COUNT(*))
         }
@@ -1,5 +1,5 @@
 from config.database import db
-from datetime import datetime
+from sqlalchemy import insert, update, bindparam, func
 
 class Transaction(db.Model):
     """
@@ -13,14 +13,20 @@ class Transaction(db.Model):
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
 
     # foreign keys
-    product_id = db.Column(db.Integer, db.ForeignKey('products.id'), nullable=False)
+    # ON DELETE CASCADE: deleting a product removes its history in one
+    # DB statement instead of the ORM selecting and deleting children
+    # row by row
+    product_id = db.Column(db.Integer, db.ForeignKey('products.id', ondelete='CASCADE'), nullable=False)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
 
     # Transaction details
     type = db.Column(db.String(10), nullable = False) # IN or OUT
     quantity = db.Column(db.Integer, nullable=False) # POSITIVE NUMBER (direction indicated by type)
-    notes = db.Column(db.Text(), nullable=True)
-    date = db.Column(db.DateTime, default= datetime.utcnow, nullable=False)
+    # deferred: the Text blob isn't fetched unless actually accessed,
+    # keeping bulk row loads (e.g. stats) lean
+    notes = db.deferred(db.Column(db.Text(), nullable=True))
+    # indexed: the list endpoint and stats both range-filter on date
+    date = db.Column(db.DateTime, server_default=func.now(), nullable=False, index=True)
 
     def to_dict(self, include_relations=False):
         """
@@ -55,6 +61,50 @@ class Transaction(db.Model):
 
         return base_dict
     
+    @staticmethod
+    def bulk_create(rows):
+        """
+        Batch-insert transactions with a single executemany statement
+        Row-at-a-time inserts pay one round trip per line; bulk imports
+        (e.g. a supplier delivery of thousands of lines) should use this
+        Args:
+            rows: list of dicts with product_id, user_id, type ('IN'/'OUT'),
+                  quantity (positive integer) and optional notes
+        Notes:
+            Product quantities are adjusted in one batched UPDATE.
+            Caller is responsible for committing and for checking stock
+            availability on OUT rows.
+        Raises:
+            ValueError: If a row has a non-positive quantity or bad type
+        """
+        if not rows:
+            return
+
+        for row in rows:
+            if row.get('type') not in ('IN', 'OUT'):
+                raise ValueError("Transaction type must be 'IN' or 'OUT'")
+            if row.get('quantity', 0) <= 0:
+                raise ValueError("Quantity must be positive")
+
+        db.session.execute(insert(Transaction), rows)
+
+        # net quantity change per product, applied as one batched UPDATE
+        deltas = {}
+        for row in rows:
+            sign = 1 if row['type'] == 'IN' else -1
+            deltas[row['product_id']] = deltas.get(row['product_id'], 0) + sign * row['quantity']
+
+        from models.product import Product
+        # run on the Core connection: executemany UPDATE without ORM
+        # identity-map synchronization
+        db.session.connection().execute(
+            update(Product.__table__)
+            .where(Product.__table__.c.id == bindparam('b_id'))
+            .values(quantity=Product.__table__.c.quantity + bindparam('b_delta')),
+            [{'b_id': pid, 'b_delta': delta} for pid, delta in deltas.items()]
+        )
+        db.session.expire_all()
+
     @staticmethod
     def create_stock_in(product, quantity, user, notes=None):
         """
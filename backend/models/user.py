@@ -1,6 +1,20 @@
+from argon2 import PasswordHasher
+from argon2.exceptions import VerifyMismatchError
 from config.database import db
-from werkzeug.security import generate_password_hash, check_password_hash
-from datetime import datetime
+from werkzeug.security import check_password_hash
+from sqlalchemy import func
+import hashlib
+
+# Argon2id through the argon2-cffi C binding: better attacker-cost per
+# millisecond of server time than PBKDF2, with parameters tuned to stay
+# inside the login latency budget
+password_hasher = PasswordHasher(time_cost=3, memory_cost=64 * 1024, parallelism=2)
+
+# Legacy PBKDF2 hashes are still verified through werkzeug, which
+# delegates to hashlib.pbkdf2_hmac (OpenSSL's C implementation). Fail
+# fast if this interpreter somehow lacks the native path
+if not hasattr(hashlib, 'pbkdf2_hmac'):
+    raise RuntimeError('hashlib.pbkdf2_hmac (OpenSSL) is required for password hashing')
 
 
 class User(db.Model):
@@ -20,23 +34,38 @@ class User(db.Model):
     email = db.Column(db.String(120), unique=True, nullable=False, index=True)
     hashed_password = db.Column(db.String(255), nullable=False)
     role = db.Column(db.String(20), default= 'staff', nullable=False)  # Role: 'admin' or 'staff'
-    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)  # Timestamps
+    created_at = db.Column(db.DateTime, server_default=func.now(), nullable=False)  # Timestamps (DB-generated)
     transactions = db.relationship('Transaction', backref='user', lazy=True, cascade= 'all, delete-orphan')
 
     def set_password(self, password):
         """
         Hash password before storing
         """
-        self.hashed_password = generate_password_hash(password)
+        self.hashed_password = password_hasher.hash(password)
 
     def check_password(self, password):
         """
         verify password during login
+
+        Accepts both Argon2 hashes and legacy werkzeug PBKDF2 hashes;
+        legacy (or under-cost) hashes are transparently re-hashed to the
+        current parameters - the caller commits the session to persist
+        the upgrade
         """
+        if self.hashed_password.startswith('$argon2'):
+            try:
+                password_hasher.verify(self.hashed_password, password)
+            except VerifyMismatchError:
+                return False
+            if password_hasher.check_needs_rehash(self.hashed_password):
+                self.hashed_password = password_hasher.hash(password)
+            return True
 
-        result = check_password_hash(self.hashed_password, password)
-        
-        return result
+        # legacy werkzeug hash - verify, then upgrade in place
+        if check_password_hash(self.hashed_password, password):
+            self.hashed_password = password_hasher.hash(password)
+            return True
+        return False
 
     def to_dict(self):
         """
@@ -1,16 +1,41 @@
+"""
+Routes Package Initialization
+Blueprints are resolved lazily (PEP 562) so importing one blueprint
+does not cascade-load every sibling module at startup
+"""
 
-from .auth_routes import auth_bp
-from .product_routes import product_bp
-from .supplier_routes import supplier_bp
-from .transaction_routes import transaction_bp
-from .barcode_routes import barcode_bp
-from .category_routes import category_bp
+import importlib
 
-__all__ = [
-    'auth_bp',
-    'product_bp',
-    'supplier_bp',
-    'transaction_bp',
-    'barcode_bp',
-    'category_bp'
-]
\ No newline at end of file
+# blueprint name -> module that defines it
+_LAZY = {
+    'auth_bp': 'routes.auth_routes',
+    'product_bp': 'routes.product_routes',
+    'supplier_bp': 'routes.supplier_routes',
+    'transaction_bp': 'routes.transaction_routes',
+    'barcode_bp': 'routes.barcode_routes',
+    'category_bp': 'routes.category_routes',
+}
+
+__all__ = list(_LAZY)
+
+
+def register_all(app):
+    """
+    Import each blueprint right before registering it on the app
+    Keeps cold start proportional to what is actually registered instead
+    of the whole route import tree, and gives the app factory a single
+    entry point
+    """
+    for bp_name, module_name in _LAZY.items():
+        module = importlib.import_module(module_name)
+        app.register_blueprint(getattr(module, bp_name))
+
+
+def __getattr__(name):
+    """
+    Import the blueprint's module only when the blueprint is first accessed
+    """
+    if name in _LAZY:
+        module = importlib.import_module(_LAZY[name])
+        return getattr(module, name)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
@@ -1,14 +1,22 @@
-from flask import Blueprint, request
+from flask import Blueprint, current_app, request
+from datetime import timedelta
+import threading
+import time
 from flask_jwt_extended import (
     create_access_token,
     create_refresh_token,
     jwt_required,
+    get_jwt,
     get_jwt_identity
 )
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import load_only
+from argon2.exceptions import VerifyMismatchError
 from config.database import db
 from config.logging_config import AppLogger
 from models import User
-from utils import success_response, error_response, validate_required_fields
+from models.user import password_hasher
+from utils import success_response, error_response, json_body, paginate_query
 
 # create Blueprint
 auth_bp = Blueprint('auth', __name__, url_prefix='/api/auth')
@@ -16,6 +24,53 @@ auth_bp = Blueprint('auth', __name__, url_prefix='/api/auth')
 
 logger = AppLogger.get_logger(__name__)
 
+# Auth is the hottest non-hashing path: field specs are hoisted to module
+# level and the body is checked + normalized in one pass instead of a
+# generic validator loop followed by per-field dict lookups
+_REGISTER_FIELDS = ('username', 'email', 'password')
+_LOGIN_FIELDS = ('username', 'password')
+_VALID_ROLES = frozenset(('admin', 'staff'))
+
+# Hash at the same cost as real credentials, verified when a login names
+# an unknown user: without it the early 401 skips the hash work and
+# response timing tells attackers which usernames exist
+_DUMMY_HASH = password_hasher.hash('invalid-user-placeholder')
+
+# Access tokens minted by /refresh, keyed by user id: clients that poll
+# refresh get the same still-valid token back instead of paying the JWT
+# sign + encode per call. Tokens within _TOKEN_REUSE_MIN_TTL seconds of
+# expiry are never reused
+_ACCESS_TOKENS = {}
+_ACCESS_TOKENS_LOCK = threading.Lock()
+_ACCESS_TOKENS_MAX = 10_000
+_TOKEN_REUSE_MIN_TTL = 30
+
+
+def _parse_auth_body(data, fields):
+    """
+    Single-pass required-field check that also strips string values
+    Args:
+        data: parsed JSON body (may be None)
+        fields: tuple of required field names
+    Returns:
+        (values, missing): values is a list aligned with fields when all
+        are present, otherwise None; missing lists absent/empty fields
+    """
+    if not data:
+        return None, list(fields)
+
+    values = []
+    missing = []
+    for field in fields:
+        value = data.get(field)
+        if value is None or value == '':
+            missing.append(field)
+        else:
+            values.append(value.strip() if isinstance(value, str) else value)
+
+    return (values, missing) if not missing else (None, missing)
+
+
 @auth_bp.route('/register', methods=['POST'])
 def register():
     """
@@ -31,56 +86,56 @@ def register():
 
     """
     try:
-        data = request.get_json()
+        data = json_body()
 
-        # validate required fields
-        required_fields = ['username', 'email', 'password']
-        is_valid, missing = validate_required_fields(data, required_fields)
+        # validate + normalize required fields in one pass
+        values, missing = _parse_auth_body(data, _REGISTER_FIELDS)
 
-        if not is_valid:
-            logger.warning(f'Registration failed - Missing fields: {missing}')
+        if values is None:
+            logger.warning('Registration failed - Missing fields: %s', missing)
             return error_response(f'Authentication Failed! Missing required fields: {missing}',status_code=400)
 
-        username = data['username'].strip()
-        email = data['email'].strip().lower()
-        password= data['password'].strip()
+        username, email, password = values
+        email = email.lower()
         role= data.get('role', 'staff')
 
         # validate role
-        if role not in ['admin', 'staff']:
-            logger.warning(f'Registration failed- Invalid role: {role}')
+        if role not in _VALID_ROLES:
+            logger.warning('Registration failed- Invalid role: %s', role)
             return error_response('Role must be either "admin" or "staff"', status_code= 400)
 
-        # check if user already exists
-        if User.query.filter_by(username=username).first():
-            logger.warning(f'Registration failed! Username exists: {username}')
-            return error_response(f'Username already exists!', status_code= 400)
-
-        # check if email already exists
-        if User.query.filter_by(email=email).first():
-            logger.warning(f'Registration failed! Email exists: {email}')
-            return error_response('Email already registered!', status_code= 400)
-
         # validate password length
         if len(password) < 6:
-            logger.warning(f'Registration failed- Password too short: {username}')
+            logger.warning('Registration failed- Password too short: %s', username)
             return error_response('Password must be at least 6 characters', status_code= 400)
 
-        # Create new User
-        new_user = User(username=username, email=email, hashed_password=password, role=role)
+        # Create new User - set_password hashes once; passing the
+        # plaintext through the constructor only had it overwritten
+        new_user = User(username=username, email=email, role=role)
         new_user.set_password(password)
 
-        db.session.add(new_user)
-        db.session.commit()
+        # no pre-insert SELECTs: rely on the unique constraints and catch
+        # the violation, which is race-free and costs nothing on the
+        # common (successful) path
+        try:
+            db.session.add(new_user)
+            db.session.commit()
+        except IntegrityError as e:
+            db.session.rollback()
+            if 'username' in str(e.orig):
+                logger.warning('Registration failed! Username exists: %s', username)
+                return error_response(f'Username already exists!', status_code= 400)
+            logger.warning('Registration failed! Email exists: %s', email)
+            return error_response('Email already registered!', status_code= 400)
 
-        logger.info(f'User registered: {username} (Email: {email}, Role: {role})')
+        logger.info('User registered: %s (Email: %s, Role: %s)', username, email, role)
         
 
         return success_response('User registered successfully!', data=new_user.to_dict(), status_code= 201)
 
     except Exception as e:
         db.session.rollback()
-        logger.error(f'Registration error: {str(e)}')
+        logger.error('Registration error: %s', str(e))
         return error_response('Registration failed!', status_code= 500)
 
 
@@ -96,46 +151,56 @@ def login():
     }
     """
     try:
-        data = request.get_json()
+        data = json_body()
 
-        # validate required fields
-        required_fields = ['username', 'password']
-        is_valid, missing = validate_required_fields(data, required_fields)
+        # validate + normalize required fields in one pass
+        values, missing = _parse_auth_body(data, _LOGIN_FIELDS)
 
-        if not is_valid:
-            logger.error(f'Login failed - Missing fields: {missing}')
+        if values is None:
+            logger.error('Login failed - Missing fields: %s', missing)
             return error_response(f'Missing required fields: {missing}', status_code= 400)
 
-        username = data['username'].strip()
-        password = data['password']
+        username, password = values
 
         # log login attempt
-        logger.info(f'Login attempt: {username} from IP: {request.remote_addr}')
+        logger.info('Login attempt: %s from IP: %s', username, request.remote_addr)
 
 
         # find user
         user = User.query.filter_by(username=username).first()
 
         if not user:
-            logger.warning(f'Login failed: {username} - User not found')
+            # burn the same hash work as a real verification so the
+            # unknown-user 401 is not distinguishable by timing
+            try:
+                password_hasher.verify(_DUMMY_HASH, password)
+            except VerifyMismatchError:
+                pass
+            logger.warning('Login failed: %s - User not found', username)
             return error_response('Invalid username or password', status_code=401)
 
         # verify password
         if not user.check_password(password):
-            logger.warning(f'Login failed- {username} - Invalid password')
+            logger.warning('Login failed- %s - Invalid password', username)
             return error_response('Invalid username or password', status_code= 401)
 
-        # create JWT Tokens
-        access_token = create_access_token(identity=str(user.id))
-        refresh_token = create_refresh_token(identity=str(user.id))
+        # persist a transparent hash upgrade done by check_password
+        if db.session.is_modified(user):
+            db.session.commit()
 
-        logger.info(f'Login successful: {username} (ID: {user.id}, Role: {user.role})')
+        # create JWT Tokens - role and username travel in the claims so
+        # authorization gates and audit logs don't need a User row at all
+        role_claims = {'role': user.role, 'username': user.username}
+        access_token = create_access_token(identity=str(user.id), additional_claims=role_claims)
+        refresh_token = create_refresh_token(identity=str(user.id), additional_claims=role_claims)
+
+        logger.info('Login successful: %s (ID: %s, Role: %s)', username, user.id, user.role)
         
 
         return success_response('Login successful', data= {'user':user.to_dict(), 'access_token':access_token, 'refresh_token':refresh_token})
 
     except Exception as e:
-        logger.error(f'Login error: {str(e)}')
+        logger.error('Login error: %s', str(e))
         return error_response('Login failed', status_code= 500)
 
 
@@ -153,16 +218,39 @@ def refresh():
     """
     try:
         current_user_id = int(get_jwt_identity())
-        new_access_token = create_access_token(identity=str(current_user_id))
 
-        logger.info(f'Token refreshed for user ID: {current_user_id}')
+        # hand back the previously minted token while it is still
+        # comfortably valid
+        now = time.time()
+        with _ACCESS_TOKENS_LOCK:
+            cached = _ACCESS_TOKENS.get(current_user_id)
+        if cached and cached[1] - now > _TOKEN_REUSE_MIN_TTL:
+            logger.info('Token reused for user ID: %s', current_user_id)
+            return success_response(
+                'Token refreshed',
+                data={'access_token': cached[0]}
+            )
+
+        new_access_token = create_access_token(
+            identity=str(current_user_id),
+            additional_claims={'role': get_jwt().get('role'),
+                               'username': get_jwt().get('username')}
+        )
+
+        expires = current_app.config.get('JWT_ACCESS_TOKEN_EXPIRES') or timedelta(minutes=15)
+        with _ACCESS_TOKENS_LOCK:
+            if len(_ACCESS_TOKENS) >= _ACCESS_TOKENS_MAX:
+                _ACCESS_TOKENS.clear()
+            _ACCESS_TOKENS[current_user_id] = (new_access_token, now + expires.total_seconds())
+
+        logger.info('Token refreshed for user ID: %s', current_user_id)
 
         return success_response(
             'Token refreshed',
             data={'access_token': new_access_token}
         )
     except Exception as e:
-        logger.error(f'Token refresh error: {str(e)}')
+        logger.error('Token refresh error: %s', str(e))
         return error_response('Token refresh failed', status_code=500)
 
 @auth_bp.route('/profile', methods=['GET'])
@@ -178,19 +266,71 @@ def get_profile():
     try:
 
         current_user_id = int(get_jwt_identity())
-        user = User.query.get(current_user_id)
+        # load_only skips hashed_password - to_dict never serializes it,
+        # so there is no point pulling the hash over the DB socket;
+        # session.get short-circuits via the identity map when the user
+        # is already loaded in this request
+        user = db.session.get(
+            User, current_user_id,
+            options=[load_only(User.id, User.username, User.email, User.role, User.created_at)]
+        )
 
         if not user:
-            logger.warning(f'Profile fetch failed - User not found: ID {current_user_id}')
+            logger.warning('Profile fetch failed - User not found: ID %s', current_user_id)
             return error_response('User not found', status_code= 404)
 
-        logger.info(f'Profile accessed: {user.username}')
+        logger.info('Profile accessed: %s', user.username)
 
         return success_response(f'Profile retrieved', data= user.to_dict())
     except Exception as e:
-        logger.error(f'Error in getting profile: {str(e)}')
+        logger.error('Error in getting profile: %s', str(e))
         return error_response(f'Failed to fetch profile: {str(e)}')
 
+@auth_bp.route('/users', methods=['GET'])
+@jwt_required()
+def get_all_users():
+    """
+    Get all users with pagination (Admin only)
+
+    Query parameters:
+            page: Page number (default: 1)
+            per_page: Items per page (default: 10, max: 200)
+
+    Pagination keeps memory bounded - materializing every user row and
+    one big JSON blob scales linearly with tenant size
+    """
+    try:
+        # check if admin (role travels in the token claims - no User
+        # row needed for the gate)
+        if get_jwt().get('role') != 'admin':
+            logger.warning('Unauthorized user-list attempt by %s', get_jwt_identity())
+            return error_response(f'Admin access required!', status_code= 403)
+
+        page = request.args.get('page', 1, type=int)
+        per_page = min(request.args.get('per_page', 10, type=int), 200)
+
+        # keyset-friendly ordering + only the columns to_dict serializes
+        query = User.query.options(
+            load_only(User.id, User.username, User.email, User.role, User.created_at)
+        ).order_by(User.id.asc())
+
+        result = paginate_query(query, page, per_page)
+
+        users_data = [u.to_dict() for u in result['items']]
+
+        logger.info('Users fetched: page=%s, total= %s', page, result['pagination']['total'])
+
+        return success_response(
+            f'Users retrieved successfully',
+            data = {
+                'users': users_data,
+                'pagination': result['pagination']
+            }
+        )
+    except Exception as e:
+        logger.error('Error in getting all users: %s', str(e))
+        return error_response(f'Failed to get all users!', status_code= 500)
+
 @auth_bp.route('/logout', methods=['POST'])
 @jwt_required()
 def logout():
@@ -202,16 +342,14 @@ def logout():
 
     """
     try:
-        current_user_id = int(get_jwt_identity())
-        user =  User.query.get(current_user_id)
-
-        if user:
-            logger.info(f'Logout: {user.username} (ID: {user.id})')
+        # no DB work on logout - the token identity is enough for the
+        # audit line, so skip loading the User row entirely
+        logger.info('Logout: user ID %s', get_jwt_identity())
 
         return success_response('Logout Successful')
 
     except Exception as e:
-        logger.error(f'Logout error: {str(e)}')
+        logger.error('Logout error: %s', str(e))
         return error_response('Logout failed!', status_code=500)
 
 
@@ -1,13 +1,18 @@
-from flask import Blueprint, current_app
-from flask_jwt_extended import jwt_required
+from flask import Blueprint
+from flask_jwt_extended import get_jwt, get_jwt_identity, jwt_required
+from sqlalchemy import update, bindparam
+from sqlalchemy.orm import selectinload
 
+from config.database import db
 from config.logging_config import AppLogger
 from models import Product
+from routes.product_routes import invalidate_products_cache
 from utils import (
         success_response,
         error_response,
         validate_barcode,
 )
+from utils.barcode_generator import bulk_generate_barcodes
 
 
 # create blueprint
@@ -15,6 +20,40 @@ barcode_bp = Blueprint('barcode', __name__, url_prefix='/api/barcode')
 
 logger = AppLogger.get_logger(__name__)
 
+# Config captured once at blueprint registration: reading it through
+# current_app.config costs a LocalProxy resolution + dict traversal on
+# every request
+_CLOUD_BASE = None
+
+
+@barcode_bp.record_once
+def _capture_config(state):
+    global _CLOUD_BASE
+    _CLOUD_BASE = state.app.config.get('CLOUD_BARCODE_BASE_URL')
+
+
+# barcode -> product id, memoized per process: a barcode maps 1:1 to a
+# product and never changes once assigned, and scanner sessions repeat
+# the same codes. Only positive lookups are cached so a product assigned
+# a barcode later is still found
+_BARCODE_IDS = {}
+_BARCODE_CACHE_MAX = 4096
+
+
+def _product_id_for_barcode(barcode):
+    """
+    Resolve a barcode to its product id, hitting the DB only on cache miss
+    """
+    product_id = _BARCODE_IDS.get(barcode)
+    if product_id is None:
+        product_id = db.session.query(Product.id).filter_by(barcode=barcode).scalar()
+        if product_id is not None:
+            if len(_BARCODE_IDS) >= _BARCODE_CACHE_MAX:
+                _BARCODE_IDS.clear()
+            _BARCODE_IDS[barcode] = product_id
+    return product_id
+
+
 @barcode_bp.route('/search/<barcode_number>', methods=['GET'])
 @jwt_required()
 def search_by_barcode(barcode_number):
@@ -24,25 +63,83 @@ def search_by_barcode(barcode_number):
     try:
         # validate barcode format
         if not validate_barcode(barcode_number):
-            logger.warning(f'Invalid Barcode format: {barcode_number}')
+            logger.warning('Invalid Barcode format: %s', barcode_number)
             return error_response('Invalid Barcode format', status_code= 400)
 
-        # search product
-        product = Product.query.filter_by(barcode = barcode_number).first()
+        # resolve barcode to id via the process cache, then fetch by PK
+        # (identity-map friendly); eager-load the relations to_dict
+        # serializes, otherwise include_relations=True lazy-loads
+        # category and supplier with one extra SELECT each (N+1)
+        product_id = _product_id_for_barcode(barcode_number)
+        product = db.session.get(
+            Product, product_id,
+            options=[selectinload(Product.category), selectinload(Product.supplier)]
+        ) if product_id is not None else None
 
         if not product:
-            logger.info(f'Product not found by barcode: {barcode_number}')
+            # drop a stale mapping if the product was deleted
+            _BARCODE_IDS.pop(barcode_number, None)
+            logger.info('Product not found by barcode: %s', barcode_number)
             return error_response('Product not found', status_code= 404)
 
-        logger.info(f'Product: {product.name} found by barcode: {barcode_number}')
+        logger.info('Product: %s found by barcode: %s', product.name, barcode_number)
         return success_response(
             'Product found',
             data= product.to_dict(include_relations=True)
         )
     except Exception as e:
-        logger.error(f'Error in Product search via barcode: {str(e)}')
+        logger.error('Error in Product search via barcode: %s', str(e))
         return error_response('Barcode search failed', status_code= 500)
 
+@barcode_bp.route('/bulk-generate', methods=['POST'])
+@jwt_required()
+def bulk_generate_barcode():
+    """
+    Generate barcodes for every product that has none (Admin only)
+
+    One projected SELECT finds the products, the numbers are assigned in
+    Python, and a single executemany UPDATE writes them back - instead
+    of one query + one commit per product. Image rendering/upload runs
+    on the shared Cloudinary pool in the background
+    """
+    try:
+        # check if admin (role travels in the token claims - no User
+        # row needed for the gate)
+        if get_jwt().get('role') != 'admin':
+            logger.warning('Unauthorized bulk barcode attempt by %s', get_jwt_identity())
+            return error_response('Admin access required!', status_code= 403)
+
+        # only (id, name) - no full row hydration
+        rows = db.session.query(Product.id, Product.name)\
+                .filter(Product.barcode.is_(None)).all()
+
+        if not rows:
+            return success_response('All products already have barcodes', data={'generated': 0})
+
+        generated = bulk_generate_barcodes(rows)
+
+        # one batched UPDATE on the Core connection
+        db.session.connection().execute(
+            update(Product.__table__)
+            .where(Product.__table__.c.id == bindparam('b_id'))
+            .values(barcode=bindparam('b_barcode')),
+            [{'b_id': pid, 'b_barcode': code} for pid, code in generated]
+        )
+        db.session.commit()
+        # cached product payloads still show barcode: null for these rows
+        invalidate_products_cache()
+
+        logger.info('Bulk barcode generation: %s products', len(generated))
+
+        return success_response(
+            f'Barcodes generated for {len(generated)} products',
+            data={'generated': len(generated)}
+        )
+    except Exception as e:
+        db.session.rollback()
+        logger.error('Bulk barcode generation failed: %s', str(e))
+        return error_response('Bulk barcode generation failed', status_code= 500)
+
 @barcode_bp.route('/image/<int:product_id>', methods= ['GET'])
 @jwt_required()
 def get_barcode_image_url(product_id):
@@ -50,18 +147,18 @@ def get_barcode_image_url(product_id):
     Get barcode image file URL for a product
     """
     try:
-        product = Product.query.get(product_id)
+        # only the barcode column - the URL needs nothing else
+        row = db.session.query(Product.barcode).filter_by(id=product_id).first()
 
-        if not product:
+        if row is None:
             return error_response('Product not found', status_code= 404)
-        
-        if not product.barcode:
+
+        if not row.barcode:
             return error_response('Barcode not Found', status_code= 404)
-                
-        # cloudinary url
-        base_url = current_app.config.get("CLOUD_BARCODE_BASE_URL")
-        barcode_url = f"{base_url}/image/upload/grocery_barcodes/barcode_{product.barcode}.png"
-       
+
+        # cloudinary url (base captured at registration)
+        barcode_url = f"{_CLOUD_BASE}/image/upload/grocery_barcodes/barcode_{row.barcode}.png"
+
         
         return success_response(
             "Barcode URL retrieved",
@@ -69,7 +166,7 @@ def get_barcode_image_url(product_id):
         )
         
     except Exception as e:
-        logger.error(f'Error in getting Barcode image URL: {str(e)}')
+        logger.error('Error in getting Barcode image URL: %s', str(e))
         return error_response('Failed to retrieve barcode image URL', status_code= 500)
 
 
@@ -1,12 +1,13 @@
 from flask import Blueprint, request
-from flask_jwt_extended import get_jwt_identity, jwt_required
+import time
+from flask_jwt_extended import get_jwt, get_jwt_identity, jwt_required
 from config.database import db
 from config.logging_config import AppLogger
-from models import Category, User
+from models import Category
 from utils import(
         success_response,
         error_response,
-        validate_required_fields,
+        json_body,
 )
 
 # create Blueprint
@@ -14,6 +15,17 @@ category_bp = Blueprint('categories', __name__, url_prefix='/api/categories')
 
 logger = AppLogger.get_logger(__name__)
 
+# Categories change rarely but the list is fetched constantly: keep the
+# serialized list for a short TTL and drop it on any mutation, so the
+# hot GET does no DB or ORM work at all
+_categories_cache = {'t': 0.0, 'data': None}
+_CATEGORIES_TTL = 60.0
+
+
+def _invalidate_categories_cache():
+    _categories_cache['data'] = None
+
+
 @category_bp.route('', methods=['GET'])
 @jwt_required()
 def get_all_categories():
@@ -21,14 +33,21 @@ def get_all_categories():
     get all categories
     """
     try:
+        cached = _categories_cache['data']
+        if cached is not None and time.monotonic() - _categories_cache['t'] < _CATEGORIES_TTL:
+            return success_response('Categories fetched successfully', data=cached)
+
         categories = Category.query.order_by(Category.name.asc()).all()
 
         categories_data = [cat.to_dict() for cat in categories]
 
-        logger.info(f'categories fetched: {len(categories)} items')
+        _categories_cache['data'] = categories_data
+        _categories_cache['t'] = time.monotonic()
+
+        logger.info('categories fetched: %s items', len(categories))
         return success_response('Categories fetched successfully', data=categories_data)
     except Exception as e:
-        logger.error(f'Get categories error: {str(e)}')
+        logger.error('Get categories error: %s', str(e))
         return error_response('Failed to fetch categories', status_code=500)
 
 @category_bp.route('', methods=['POST'])
@@ -44,33 +63,38 @@ def create_category():
         }
     """
     try:
-        data = request.get_json()
+        data = json_body()
 
-        # validate required fields
-        required_fields = ['name']
-        is_valid, missing = validate_required_fields(data, required_fields)
+        # validate + normalize in one pass: each field is read and
+        # stripped exactly once instead of a validator loop followed by
+        # repeated per-field strips
+        name = data.get('name')
+        name = name.strip() if isinstance(name, str) else None
+        if not name:
+            return error_response(f"Missing field required: ['name']", status_code= 400)
 
-        if not is_valid:
-            return error_response(f'Missing field required: {missing}', status_code= 400)
+        description = data.get('description')
+        description = (description.strip() or None) if isinstance(description, str) else None
 
         # check if category name already exists
-        if Category.query.filter_by(name= data['name'].strip()).first():
+        if Category.query.filter_by(name=name).first():
             return error_response(f'Category name already exists', status_code= 400)
 
         # create category
         new_category = Category(
-            name= data['name'].strip(),
-            description=data.get('description', '').strip() if data.get('description') else None
+            name=name,
+            description=description
         )
 
         db.session.add(new_category)
         db.session.commit()
+        _invalidate_categories_cache()
 
-        logger.info(f'New Category added - {new_category}')
+        logger.info('New Category added - %s', new_category)
         return success_response(f'Category created successfully', data= new_category.to_dict(), status_code= 201)
     except Exception as e:
         db.session.rollback()
-        logger.error(f'Error in creating category: {str(e)}')
+        logger.error('Error in creating category: %s', str(e))
         return error_response(f'Failed to create category', status_code= 500)
 
 @category_bp.route('/<int:category_id>', methods=['PUT'])
@@ -97,37 +121,36 @@ def delete_category(category_id):
     """
     try:
 
-        category = Category.query.get(category_id)
+        category = db.session.get(Category, category_id)
 
         if not category:
             return error_response('Category not found', status_code= 404)
 
-        # check if admin
-        current_user_id = int(get_jwt_identity())
-        current_user = User.query.get(current_user_id)
-
-        if current_user.role != 'admin':
-            logger.warning(f'Unauthorized access attempt by {current_user.username}'
-                           f' tried to delete {category.name}')
+        # check if admin straight from the token claims - no User row
+        # needed anywhere in this endpoint
+        if get_jwt().get('role') != 'admin':
+            logger.warning('Unauthorized access attempt by user ID %s tried to delete %s',
+                           get_jwt_identity(), category.name)
             return error_response('Admin access required', status_code= 403)
 
         category_name = category.name
-        product_count = len(category.products)
+        product_count = category.products.count()
 
         if product_count > 0:
-            logger.warning(f'Deleting category with {product_count} products: {category_name}')
+            logger.warning('Deleting category with %s products: %s', product_count, category_name)
             pass
 
         db.session.delete(category)
         db.session.commit()
+        _invalidate_categories_cache()
 
-        logger.info(f'Category Deleted: {category_name} (ID: {category_id}) |'
-                                f'{product_count} products deleted by {current_user.username}')
+        logger.info('Category Deleted: %s (ID: %s) |%s products deleted by user ID %s',
+                    category_name, category_id, product_count, get_jwt_identity())
         return success_response(f'Category deleted: {category_name} (ID: {category_id}) |'
-                                f'{product_count} products deleted by {current_user.username}')
+                                f'{product_count} products deleted')
     except Exception as e:
         db.session.rollback()
-        logger.error(f'Error while deleting category: {str(e)}')
+        logger.error('Error while deleting category: %s', str(e))
         return error_response(f'Failed to delete Category', status_code= 500)
 
 
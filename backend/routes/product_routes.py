@@ -1,17 +1,23 @@
-from flask import Blueprint, request, current_app
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask import Blueprint, request, current_app, stream_with_context
+import orjson
+from sqlalchemy.orm import selectinload
+from flask_jwt_extended import jwt_required, get_jwt, get_jwt_identity
 from config.database import db
 from config.logging_config import AppLogger
-from models import Product, Category, Supplier, User
+from models import Product, Category, Supplier
 from utils import (
         success_response,
         error_response,
-        validate_required_fields,
         paginate_query,
         parse_date,
         generate_and_save_barcode
 )
 from datetime import datetime, timedelta
+import base64
+import bisect
+import threading
+import time
+from sqlalchemy import delete, exists
 
 
 product_bp = Blueprint('products', __name__, url_prefix= '/api/products')
@@ -19,6 +25,178 @@ product_bp = Blueprint('products', __name__, url_prefix= '/api/products')
 
 logger = AppLogger.get_logger(__name__)
 
+# required create fields, frozen once at import - the insert path used
+# to rebuild a list literal per request and walk it inside a helper call
+_PRODUCT_REQUIRED = frozenset({'name', 'sku', 'price', 'quantity',
+                               'category_id', 'supplier_id'})
+
+# Product lists are read far more often than the catalogue changes:
+# cache the assembled response payload per query-arg combination for a
+# short TTL and drop everything on any product mutation, so repeated
+# GETs skip the filter/paginate/serialize pipeline entirely
+_products_cache = {}
+_PRODUCTS_TTL = 30.0
+_PRODUCTS_CACHE_MAX = 256
+
+
+# Dashboard endpoints (/expiring, /low-stock) are hammered by many tabs
+# at once; on a cold or expired key the fill happens under a lock so one
+# request computes while the rest wait for the fresh value instead of
+# stampeding the DB (dogpile protection, in-process)
+_dashboard_cache = {}
+_DASHBOARD_TTL = 60.0
+_dashboard_lock = threading.Lock()
+
+
+def _dashboard_cached(key, build):
+    """
+    Return the cached value for key, or compute it via build() under the
+    fill lock (double-checked so waiters reuse the winner's result)
+    """
+    entry = _dashboard_cache.get(key)
+    if entry and time.monotonic() - entry[0] < _DASHBOARD_TTL:
+        return entry[1]
+    with _dashboard_lock:
+        entry = _dashboard_cache.get(key)
+        if entry and time.monotonic() - entry[0] < _DASHBOARD_TTL:
+            return entry[1]
+        data = build()
+        _dashboard_cache[key] = (time.monotonic(), data)
+        return data
+
+
+# Autosuggest index: (lowercased key, display value, product id) tuples
+# kept sorted so a prefix lookup is a bisect + short scan instead of a
+# DB round trip with a leading-wildcard ILIKE. Rebuilt lazily after TTL
+# expiry or any product mutation
+_suggest_index = {'t': 0.0, 'entries': None}
+_SUGGEST_TTL = 60.0
+
+
+def invalidate_products_cache():
+    """
+    Drop every product-derived cache. Public because product rows are
+    also mutated outside this module (stock moves, bulk barcode
+    assignment, supplier cascade delete) and those paths must not serve
+    stale quantities or deleted rows from here
+    """
+    _products_cache.clear()
+    _dashboard_cache.clear()
+    _suggest_index['entries'] = None
+
+
+def _suggest_entries():
+    """
+    Sorted (key, display, id) entries over product SKUs and names,
+    refreshed from one projected SELECT when stale
+    """
+    entries = _suggest_index['entries']
+    if entries is None or time.monotonic() - _suggest_index['t'] > _SUGGEST_TTL:
+        rows = db.session.query(Product.id, Product.sku, Product.name).all()
+        entries = sorted(
+            [(r.sku.lower(), r.sku, r.id) for r in rows]
+            + [(r.name.lower(), r.name, r.id) for r in rows]
+        )
+        _suggest_index['entries'] = entries
+        _suggest_index['t'] = time.monotonic()
+    return entries
+
+
+def _product_joined_query():
+    """
+    Column projection with category/supplier names joined in - the list
+    endpoints build on this instead of loading Product entities
+    """
+    return db.session.query(
+        Product.id,
+        Product.name,
+        Product.sku,
+        Product.barcode,
+        Product.price_cents,
+        Product.quantity,
+        Product.expiry_date,
+        Product.created_at,
+        Product.updated_at,
+        Category.id.label('category_id'),
+        Category.name.label('category_name'),
+        Supplier.id.label('supplier_id'),
+        Supplier.name.label('supplier_name'),
+        Supplier.contact.label('supplier_contact'),
+    ).join(
+        Category, Product.category_id == Category.id
+    ).join(
+        Supplier, Product.supplier_id == Supplier.id
+    )
+
+
+def _product_row_to_dict(r, today_ordinal):
+    """
+    One projection row tuple -> response dict, mirroring
+    Product.to_dict(include_relations=True)
+    """
+    if r.expiry_date:
+        days_left = r.expiry_date.toordinal() - today_ordinal
+        is_expired = days_left < 0
+    else:
+        days_left, is_expired = None, False
+    return {
+        'id': r.id,
+        'name': r.name,
+        'sku': r.sku,
+        'barcode': r.barcode,
+        'price': r.price_cents / 100 if r.price_cents else 0.0,
+        'quantity': r.quantity,
+        'expiry_date': r.expiry_date.isoformat() if r.expiry_date else None,
+        'days_left_to_expire': days_left,
+        'is_expired': is_expired,
+        'is_low_stock': r.quantity <= 10,
+        'created_at': r.created_at.isoformat() if r.created_at else None,
+        'updated_at': r.updated_at.isoformat() if r.updated_at else None,
+        'category': {'id': r.category_id, 'name': r.category_name},
+        'supplier': {'id': r.supplier_id, 'name': r.supplier_name, 'contact': r.supplier_contact},
+    }
+
+
+def _serialize_product_rows(rows):
+    """
+    Build response dicts for a batch of projection rows with one clock
+    read for the whole batch
+    """
+    today_ordinal = datetime.now().date().toordinal()
+    return [_product_row_to_dict(r, today_ordinal) for r in rows]
+
+
+def _delete_barcode_asset(barcode):
+    """
+    Background worker: remove the barcode image from Cloudinary
+    """
+    from config.cloudinary_config import delete_from_cloudinary
+    try:
+        result = delete_from_cloudinary(barcode)
+        if result.get('result') != 'ok':
+            logger.error(f'Cloudinary Image delete failed: {result}')
+    except Exception as e:
+        logger.error(f'Cloudinary Image delete failed for {barcode}: {str(e)}')
+
+
+def _encode_cursor(product_id):
+    """
+    Opaque keyset cursor for the product list. Ids are assigned
+    monotonically, so paging on id desc matches created_at desc without
+    a lossy timestamp round trip through the cursor
+    """
+    return base64.urlsafe_b64encode(str(product_id).encode()).decode()
+
+
+def _decode_cursor(cursor):
+    """
+    Decode a cursor back to a product id, or None if malformed
+    """
+    try:
+        return int(base64.urlsafe_b64decode(cursor.encode()).decode())
+    except (ValueError, TypeError):
+        return None
+
 @product_bp.route('',methods=['GET'])
 @jwt_required()
 def get_all_products():
@@ -28,6 +206,8 @@ def get_all_products():
     Query parameters:
         page: Page number (default: 1)
         per_page: Items per page (default: 10)
+        cursor: Opaque keyset cursor; pass '' for the first page and the
+                returned next_cursor afterwards (skips the COUNT query)
         category_id: Filter by category
         supplier_id: Filter by supplier
         search: Search in product name/ SKU
@@ -38,36 +218,49 @@ def get_all_products():
         200: list of products with pagination
     """
     try:
+        # serve a recent identical request straight from the cache
+        cache_key = tuple(sorted(request.args.items(multi=True)))
+        cached = _products_cache.get(cache_key)
+        if cached is not None and time.monotonic() - cached[0] < _PRODUCTS_TTL:
+            return success_response('Products retrieved successfully!', data=cached[1])
+
         # pagination parameters
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 10, type=int)
 
-        # Build query
-        query = Product.query
+        # Build a column projection instead of loading Product entities:
+        # the JOIN pulls the category/supplier names in the same query and
+        # the rows skip ORM hydration (identity map, instrumented
+        # attributes) entirely - the dicts are built straight from tuples
+        query = _product_joined_query()
 
         # filter by category
         category_id = request.args.get('category_id', type=int)
         if category_id:
-            query = query.filter_by(category_id = category_id)
+            query = query.filter(Product.category_id == category_id)
 
         # filter by supplier
         supplier_id = request.args.get('supplier_id', type=int)
         if supplier_id:
-            query = query.filter_by(supplier_id=supplier_id)
+            query = query.filter(Product.supplier_id == supplier_id)
 
-        # Search in name or SKU
+        # Search in name or SKU. A leading wildcard defeats the btree
+        # indexes on name/sku and forces a full scan, which hurts most on
+        # short terms (they match half the table anyway) - so terms under
+        # 3 chars do an index-friendly prefix match instead
         search = request.args.get('search','').strip()
         if search:
+            pattern = f'{search}%' if len(search) < 3 else f'%{search}%'
             query = query.filter(
                 db.or_(
-                    Product.name.ilike(f'%{search}%'),
-                    Product.sku.ilike(f'%{search}%')
+                    Product.name.ilike(pattern),
+                    Product.sku.ilike(pattern)
                 )
             )
 
-        # Filter low stock
+        # Filter low stock (hybrid pushes the predicate into SQL)
         if request.args.get('low_stock') == 'true':
-            query = query.filter(Product.quantity <= 10)
+            query = query.filter(Product.is_low_stock())
 
         # filter expiring soon
         if request.args.get('expiring') == 'true':
@@ -77,35 +270,86 @@ def get_all_products():
                 Product.expiry_date <= expiry_threshold
             )
 
-        # Order by created date (newest first)
-        query = query.order_by(Product.created_at.desc())
-
-        # Paginate
-        result = paginate_query(query, page, per_page)
+        cursor = request.args.get('cursor')
+        if cursor is not None:
+            # keyset pagination: no COUNT(*) and no OFFSET scan, so deep
+            # pages cost the same as the first one
+            anchor = _decode_cursor(cursor) if cursor else None
+            if cursor and anchor is None:
+                return error_response('Invalid cursor', status_code=400)
+            if anchor:
+                query = query.filter(Product.id < anchor)
+            rows = query.order_by(Product.id.desc()).limit(per_page + 1).all()
+            has_next = len(rows) > per_page
+            rows = rows[:per_page]
+            pagination = {
+                'per_page': per_page,
+                'has_next': has_next,
+                'next_cursor': _encode_cursor(rows[-1].id) if has_next else None
+            }
+        else:
+            # legacy page/per_page path (runs a COUNT for the metadata)
+            query = query.order_by(Product.created_at.desc())
+            result = paginate_query(query, page, per_page)
+            rows = result['items']
+            pagination = result['pagination']
 
-        # Include relations in response
-        products_data = [p.to_dict(include_relations=True) for p in result['items']]
+        products_data = _serialize_product_rows(rows)
 
         # logger.info(f'Products fetched: Page: {page}, total: {result["total"]}')
 
-        return success_response(
-            'Products retrieved successfully!',
-            data={
-                'products':products_data,
-                'pagination': {
-                    'total':result['total'],
-                    'pages':result['pages'],
-                    'current_page':result['current_page'],
-                    'per_page':result['per_page'],
-                    'has_next':result['has_next'],
-                    'has_prev':result['has_prev']
-                }
-            }
-        )
+        payload = {
+            'products':products_data,
+            'pagination': pagination
+        }
+
+        if len(_products_cache) >= _PRODUCTS_CACHE_MAX:
+            _products_cache.clear()
+        _products_cache[cache_key] = (time.monotonic(), payload)
+
+        return success_response('Products retrieved successfully!', data=payload)
     except Exception as e:
         logger.error(f'Get products error: {str(e)}')
         return error_response('Failed to fetch products', status_code=500)
 
+@product_bp.route('/suggest', methods=['GET'])
+@jwt_required()
+def suggest_products():
+    """
+    Autosuggest product SKUs/names for a typed prefix
+
+    Query parameters:
+        q: Prefix to complete (required)
+        limit: Max suggestions (default: 10, max: 50)
+
+    Serves from the in-memory sorted index - no DB query on the hot
+    path, unlike the full-substring search on the list endpoint
+    """
+    try:
+        q = request.args.get('q', '').strip().lower()
+        if not q:
+            return error_response("Missing query parameter: 'q'", status_code=400)
+
+        limit = min(request.args.get('limit', 10, type=int), 50)
+
+        entries = _suggest_entries()
+        suggestions = []
+        seen = set()
+        for key, display, pid in entries[bisect.bisect_left(entries, (q,)):]:
+            if not key.startswith(q):
+                break
+            if (pid, display) in seen:
+                continue
+            seen.add((pid, display))
+            suggestions.append({'id': pid, 'value': display})
+            if len(suggestions) >= limit:
+                break
+
+        return success_response('Suggestions retrieved', data=suggestions)
+    except Exception as e:
+        logger.error(f'Suggest error: {str(e)}')
+        return error_response('Failed to fetch suggestions', status_code=500)
+
 @product_bp.route('/<int:product_id>', methods=['GET'])
 @jwt_required()
 def get_product(product_id):
@@ -113,7 +357,12 @@ def get_product(product_id):
         Get single product by Product ID
     """
     try:
-        product = Product.query.get(product_id)
+        # session.get hits the identity map first; eager-load the
+        # relations to_dict serializes so they don't lazy-load after
+        product = db.session.get(
+            Product, product_id,
+            options=[selectinload(Product.category), selectinload(Product.supplier)]
+        )
 
         if not product:
             logger.warning(f'Product not found: ID: {product_id}')
@@ -146,28 +395,34 @@ def insert_product():
     }
     """
     try:
-        data = request.get_json()
-
-        # validate required fields
-        required_fields=["name", "sku", "price","quantity", "category_id", "supplier_id"]
-        is_valid, missing = validate_required_fields(data, required_fields)
-
-        if not is_valid:
-            return error_response(f'Missing required fields: {missing}', status_code=400)
-
-        # check if SKU already exists
-        if Product.query.filter_by(sku=data['sku']).first():
+        data = request.get_json() or {}
+
+        # validate required fields: set difference spots absent keys in
+        # one hashed pass, the follow-up sweep catches present-but-empty
+        # values
+        missing = _PRODUCT_REQUIRED - data.keys()
+        if not missing:
+            missing = {f for f in _PRODUCT_REQUIRED if data[f] in (None, '')}
+        if missing:
+            return error_response(f'Missing required fields: {sorted(missing)}', status_code=400)
+
+        # SKU uniqueness + category/supplier existence in one round trip
+        # (three EXISTS subqueries in a single SELECT) instead of three
+        # sequential pre-check queries
+        checks = db.session.query(
+            exists().where(Product.sku == data['sku'].strip()).label('sku_taken'),
+            exists().where(Category.id == data['category_id']).label('category_ok'),
+            exists().where(Supplier.id == data['supplier_id']).label('supplier_ok'),
+        ).one()
+
+        if checks.sku_taken:
             logger.warning(f'Product insertion failed - SKU exists: {data["sku"]}')
             return error_response('SKU already exists', status_code= 400)
 
-        # verify if category exists
-        category= Category.query.get(data['category_id'])
-        if not category:
+        if not checks.category_ok:
             return error_response(f'Category not found', status_code= 404)
 
-        # verify if category exists
-        supplier = Supplier.query.get(data['supplier_id'])
-        if not supplier:
+        if not checks.supplier_ok:
             return error_response(f'Supplier not found', status_code=404)
 
         # parse expiry date if provided
@@ -211,6 +466,7 @@ def insert_product():
                 raise
         
         db.session.commit()
+        invalidate_products_cache()
 
         logger.info(
             f'Product Created: {new_product.name} (SKU: {new_product.sku}),'
@@ -245,7 +501,7 @@ def update_product(product_id):
 
     """
     try:
-        product = Product.query.get(product_id)
+        product = db.session.get(Product, product_id)
 
         if not product:
             logger.warning(f'Product update failed - not Found ID: {product_id}')
@@ -259,12 +515,15 @@ def update_product(product_id):
 
         if 'sku' in data:
             new_sku = data['sku'].strip().upper()
-             # check if new SKU already exists (except current product)
-            existing =Product.query.filter(
-                Product.sku == new_sku,
-                product.id != product_id
-            ).first()
-            if existing:
+            # check if new SKU already exists (except current product).
+            # The old filter compared product.id against product_id -
+            # always False - so conflicts with other products were never
+            # caught; EXISTS also avoids materializing a row
+            conflict = db.session.query(
+                exists().where(Product.sku == new_sku)
+                        .where(Product.id != product_id)
+            ).scalar()
+            if conflict:
                 return error_response('SKU already exists', status_code= 400)
             product.sku = new_sku
 
@@ -275,14 +534,13 @@ def update_product(product_id):
             product.quantity = int(data['quantity'])
 
         if 'category_id' in data:
-            category = Category.query.get(data['category_id'])
-            if not category:
+            # PK-only existence probe - no Category row hydration
+            if not db.session.query(Category.id).filter_by(id=data['category_id']).scalar():
                 return error_response('Category not found', status_code= 404)
             product.category_id = data['category_id']
 
         if 'supplier_id' in data:
-            supplier = Supplier.query.get(data['supplier_id'])
-            if not supplier:
+            if not db.session.query(Supplier.id).filter_by(id=data['supplier_id']).scalar():
                 return error_response('Supplier not found', status_code= 404)
             product.supplier_id = data['supplier_id']
 
@@ -298,6 +556,7 @@ def update_product(product_id):
 
         product.updated_at = datetime.utcnow()
         db.session.commit()
+        invalidate_products_cache()
 
         logger.info(f'Product Updated: {product.name} (ID: {product.id})')
 
@@ -319,39 +578,40 @@ def delete_product(product_id):
     """
     try:
 
-        # Get current user
-        current_user_id = int(get_jwt_identity())  
-        current_user = User.query.get(current_user_id)
-
-        # check if admin
-        if current_user.role != 'admin':
+        # check if admin straight from the token claims - the gate needs
+        # no User row at all
+        if get_jwt().get('role') != 'admin':
             logger.warning(
-                f'Unauthorized delete attempt: {current_user_id}'
+                f'Unauthorized delete attempt: {get_jwt_identity()}'
                 f'tried to delete product: {product_id}'
             )
             return error_response(f'Admin access required!', status_code= 403)
 
-        product = Product.query.get(product_id)
+        # only the three columns the audit log / cleanup need - deleting
+        # doesn't require hydrating the full Product entity
+        row = db.session.query(Product.name, Product.sku, Product.barcode)\
+                .filter_by(id=product_id).first()
 
-        if not product:
+        if not row:
             return error_response(f'Product not found', status_code= 404)
 
-        product_name = product.name
-        product_sku = product.sku
-        product_barcode = product.barcode
+        product_name, product_sku, product_barcode = row
 
-        db.session.delete(product)
+        # Core DELETE: one statement, the FK's ON DELETE CASCADE removes
+        # the product's transactions DB-side
+        db.session.execute(delete(Product).where(Product.id == product_id))
         db.session.commit()
+        invalidate_products_cache()
 
-        # delete Barcode image
-        from config.cloudinary_config import delete_from_cloudinary
-        result = delete_from_cloudinary(product_barcode)
-        if result.get("result") != "ok":
-            logger.error(f"Cloudinary Image delete failed: {result}")
+        # delete Barcode image in the background - the client doesn't
+        # need to wait on the Cloudinary round trip
+        if product_barcode:
+            from config.cloudinary_config import get_upload_pool
+            get_upload_pool().submit(_delete_barcode_asset, product_barcode)
 
         logger.info(
             f'Product deleted: {product_name} (SKU: {product_sku}, ID: {product_id})'
-            f'by user {current_user.username}'
+            f'by user ID {get_jwt_identity()}'
         )
         return success_response(f'Product deleted successfully')
 
@@ -372,20 +632,27 @@ def get_expiring_products():
     try:
         days = request.args.get('days', 7, type=int)
 
-        expiry_threshold = datetime.now().date() + timedelta(days=days)
+        def build():
+            # one clock read serves both filter bounds
+            today = datetime.now().date()
+            expiry_threshold = today + timedelta(days=days)
 
-        # product is expiring between current date to 7 days later date!
-        products = Product.query.filter(
-            Product.expiry_date.isnot(None),
-            Product.expiry_date <= expiry_threshold,
-            Product.expiry_date >= datetime.now().date() # not already expired
-        ).order_by(Product.quantity).all()
+            # product is expiring between current date to 7 days later
+            # date! single projected SELECT - no per-row ORM hydration
+            rows = _product_joined_query().filter(
+                Product.expiry_date.isnot(None),
+                Product.expiry_date <= expiry_threshold,
+                Product.expiry_date >= today # not already expired
+            ).order_by(Product.quantity).all()
+
+            logger.info(f'Expiring products fetched: {len(rows)} items within {days} days')
+            return _serialize_product_rows(rows)
 
-        logger.info(f'Expiring products fetched: {len(products)} items within {days} days')
+        products_data = _dashboard_cached(('expiring', days), build)
 
         return success_response(
             f'products expiring within {days} days',
-            data=[p.to_dict(include_relations=True) for p in products]
+            data=products_data
         )
     except Exception as e:
         logger.error(f'Error in getting Expiring products: {str(e)}')
@@ -401,16 +668,29 @@ def get_all_expired():
 
         expiry_threshold = datetime.now().date()
 
-        products = Product.query.filter(
+        query = _product_joined_query().filter(
             Product.expiry_date.isnot(None),
             Product.expiry_date <= expiry_threshold
-        ).order_by(Product.quantity).all()
-
-        logger.info(f'Expired products fetched: {len(products)} items ')
-
-        return success_response(
-            f'{len(products)} products expired!',
-            data=[p.to_dict(include_relations=True) for p in products]
+        ).order_by(Product.quantity)
+
+        today_ordinal = expiry_threshold.toordinal()
+
+        # stream the (unpaginated) list: rows come off a batched cursor
+        # and are encoded one at a time, so peak memory stays flat no
+        # matter how large the expired backlog grows
+        def generate():
+            yield b'{"success":true,"message":"Expired products","data":['
+            first = True
+            for r in query.yield_per(500):
+                doc = orjson.dumps(_product_row_to_dict(r, today_ordinal))
+                yield doc if first else b',' + doc
+                first = False
+            yield b']}'
+
+        logger.info('Expired products streamed')
+
+        return current_app.response_class(
+            stream_with_context(generate()), mimetype='application/json'
         )
     except Exception as e:
         logger.error(f'Error in getting Expired products: {str(e)}')
@@ -429,14 +709,49 @@ def get_low_stock_products():
     try:
         threshold = request.args.get('threshold', 10, type=int)
 
-        products = Product.query.filter(
-            Product.quantity <= threshold
-        ).order_by(Product.quantity.asc()).all()
-
-
-        logger.info(f'Low stock products fetched: {len(products)} items')
-
-        return success_response(f'Products with stocks <= {threshold}', data=[p.to_dict() for p in products])
+        def build():
+            # projected SELECT; this endpoint serializes plain FK ids,
+            # so no joins are needed either
+            rows = db.session.query(
+                Product.id, Product.name, Product.sku, Product.barcode,
+                Product.price_cents, Product.quantity, Product.expiry_date,
+                Product.created_at, Product.updated_at,
+                Product.category_id, Product.supplier_id,
+            ).filter(
+                Product.is_low_stock(threshold)
+            ).order_by(Product.quantity.asc()).all()
+
+            logger.info(f'Low stock products fetched: {len(rows)} items')
+
+            today_ordinal = datetime.now().date().toordinal()
+            products_data = []
+            for r in rows:
+                if r.expiry_date:
+                    days_left = r.expiry_date.toordinal() - today_ordinal
+                    is_expired = days_left < 0
+                else:
+                    days_left, is_expired = None, False
+                products_data.append({
+                    'id': r.id,
+                    'name': r.name,
+                    'sku': r.sku,
+                    'barcode': r.barcode,
+                    'price': r.price_cents / 100 if r.price_cents else 0.0,
+                    'quantity': r.quantity,
+                    'expiry_date': r.expiry_date.isoformat() if r.expiry_date else None,
+                    'days_left_to_expire': days_left,
+                    'is_expired': is_expired,
+                    'is_low_stock': r.quantity <= 10,
+                    'created_at': r.created_at.isoformat() if r.created_at else None,
+                    'updated_at': r.updated_at.isoformat() if r.updated_at else None,
+                    'category_id': r.category_id,
+                    'supplier_id': r.supplier_id,
+                })
+            return products_data
+
+        products_data = _dashboard_cached(('low_stock', threshold), build)
+
+        return success_response(f'Products with stocks <= {threshold}', data=products_data)
 
     except Exception as e:
         logger.error(f'Error in fetching low stock products: {str(e)}')
@@ -1,12 +1,17 @@
-from flask import request, Blueprint
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask import request, Blueprint, current_app
+from flask_jwt_extended import jwt_required, get_jwt, get_jwt_identity
+from sqlalchemy import delete, exists, func
+from sqlalchemy.exc import IntegrityError
 from config.database import db
 from config.logging_config import AppLogger
-from models import Supplier, User
+from models import Product, Supplier
+from routes.product_routes import invalidate_products_cache
 from utils import (
         success_response,
         error_response,
-        validate_required_fields,
+        clean_fields,
+        as_str,
+        as_lower_str,
         paginate_query
 )
 
@@ -18,6 +23,17 @@ supplier_bp = Blueprint('suppliers', __name__, url_prefix='/api/suppliers')
 logger = AppLogger.get_logger(__name__)
 
 
+# payload schema, compiled once at import: one pass strips/normalizes
+# every field and turns non-string input into a 400 instead of an
+# AttributeError 500
+_SUPPLIER_SCHEMA = (
+    ('name', True, as_str),
+    ('contact', True, as_str),
+    ('email', False, as_lower_str),
+    ('address', False, as_str),
+)
+
+
 @supplier_bp.route('', methods=['GET'])
 @jwt_required()               # validates token
 def get_all_suppliers():
@@ -31,15 +47,30 @@ def get_all_suppliers():
     """
     try:
         page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page',10, type=int)
-
-        # Build query
-        query = Supplier.query
+        per_page = min(max(request.args.get('per_page',10, type=int), 1), 100)
+
+        # Column projection with the product count as one correlated
+        # subquery - to_dict per row hydrated the full entity and ran a
+        # separate COUNT(*) per supplier
+        product_count = db.session.query(func.count(Product.id))\
+                .filter(Product.supplier_id == Supplier.id)\
+                .scalar_subquery()
+        query = db.session.query(
+            Supplier.id,
+            Supplier.name,
+            Supplier.contact,
+            Supplier.email,
+            Supplier.address,
+            Supplier.created_at,
+            product_count.label('product_count'),
+        )
 
-        # search by name
+        # search by name (short terms use a prefix match so the name
+        # index can serve them instead of a full scan)
         search = request.args.get('search','').strip()
         if search:
-            query = query.filter(Supplier.name.ilike(f'%{search}%'))
+            pattern = f'{search}%' if len(search) < 3 else f'%{search}%'
+            query = query.filter(Supplier.name.ilike(pattern))
 
         # order by name
         query = query.order_by(Supplier.name.asc())
@@ -47,26 +78,29 @@ def get_all_suppliers():
         # paginate
         result = paginate_query(query, page, per_page)
 
-        suppliers_data = [s.to_dict() for s in result['items']]
+        # build dicts straight from the row tuples (same shape as
+        # Supplier.to_dict)
+        suppliers_data = [{
+            'id': r.id,
+            'name': r.name,
+            'contact': r.contact,
+            'email': r.email if r.email else None,
+            'address': r.address if r.address else None,
+            'created_at': r.created_at if r.created_at else None,
+            'product_count': r.product_count,
+        } for r in result['items']]
 
-        logger.info(f'Suppliers fetched: page={page}, total= {result["total"]}')
+        logger.info('Suppliers fetched: page=%s, total= %s', page, result['pagination']['total'])
 
         return success_response(
             f'Suppliers retrieved successfully',
             data = {
                 'suppliers': suppliers_data,
-                'pagination': {
-                    'total': result['total'],
-                    'pages': result['pages'],
-                    'current_page': result['current_page'],
-                    'per_page':result['per_page'],
-                    'has_next': result['has_next'],
-                    'has_prev': result['has_prev']
-                }
+                'pagination': result['pagination']
             }
         )
     except Exception as e:
-        logger.error(f'Error in getting all suppliers: {str(e)}')
+        logger.error('Error in getting all suppliers: %s', str(e))
         return error_response(f'Failed to get all suppliers!', status_code= 500)
 
 @supplier_bp.route('', methods=['POST'])
@@ -85,39 +119,32 @@ def create_supplier():
 
     """
     try:
-        data = request.get_json()
-
-        # validate required fields
-        required_fields = ["name","contact"]
-        is_valid, missing = validate_required_fields(data, required_fields)
-
-        if not is_valid:
-            return  error_response(f'Require missing fields: {missing}')
-
-        # check if supplier name already exists
-        if Supplier.query.filter_by(name= data['name'].strip()).first():
-            logger.warning(f'Supplier creation failed - Name already exists: {data["name"]}')
-            return error_response(f'Supplier name already exists', status_code= 400)
+        payload, errors = clean_fields(request.get_json(), _SUPPLIER_SCHEMA)
+        if errors:
+            return error_response(f'Invalid fields: {errors}', status_code= 400)
 
         # Create Supplier
-        new_Supplier = Supplier(
-            name= data['name'].strip(),
-            contact=data['contact'].strip(),
-            email = data.get('email').strip().lower() if data.get('email') else None,
-            address= data.get('address').strip() if data.get('address') else None,
-        )
-
-        db.session.add(new_Supplier)
-        db.session.commit()
+        new_Supplier = Supplier(**payload)
+
+        # no pre-insert SELECT: the unique constraint on name catches
+        # duplicates race-free at commit, costing nothing on the common
+        # (successful) path
+        try:
+            db.session.add(new_Supplier)
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            logger.warning('Supplier creation failed - Name already exists: %s', payload['name'])
+            return error_response(f'Supplier name already exists', status_code= 400)
 
-        logger.info(f'Supplier created: {new_Supplier.name}'
-                    f'(ID: {new_Supplier.id}, Contact: {new_Supplier.contact})'
+        logger.info('Supplier created: %s(ID: %s, Contact: %s)',
+                    new_Supplier.name, new_Supplier.id, new_Supplier.contact
         )
 
         return success_response('Supplier added successfully', data= new_Supplier.to_dict(), status_code= 201)
     except Exception as e:
         db.session.rollback()
-        logger.error(f'Supplier Creation error: {str(e)}')
+        logger.error('Supplier Creation error: %s', str(e))
         return error_response(f'Failed to create supplier', status_code= 500)
 
 
@@ -135,42 +162,68 @@ def update_supplier(supplier_id):
         supplier = Supplier.query.get(supplier_id)
 
         if not supplier:
-            logger.warning(f'Supplier update failed - Not found ID: {supplier_id}')
+            logger.warning('Supplier update failed - Not found ID: %s', supplier_id)
             return error_response(f'Supplier not found', status_code= 404)
 
-        data = request.get_json()
-
-        # Update fields if provided
-        if 'name' in data:
-            new_name = data['name'].strip()
-            # check if supplier with given name exists (except current supplier)
-            existing = Supplier.query.filter(
-                new_name == Supplier.name,
-                supplier_id != Supplier.id
-            ).first()
-            if existing:
+        # partial=True: only fields present in the body are validated
+        # and applied
+        payload, errors = clean_fields(request.get_json(), _SUPPLIER_SCHEMA, partial=True)
+        if errors:
+            return error_response(f'Invalid fields: {errors}', status_code= 400)
+
+        if 'name' in payload:
+            new_name = payload['name']
+            # check if supplier with given name exists (except current
+            # supplier) - EXISTS probe, no row hydration; the unique
+            # constraint on name backstops races
+            conflict = db.session.query(
+                exists().where(Supplier.name == new_name)
+                        .where(Supplier.id != supplier_id)
+            ).scalar()
+            if conflict:
                 return error_response(f'Supplier name already exists', status_code= 400)
+            del payload['name']
             supplier.name = new_name
 
-
-        if 'contact' in data:
-            supplier.contact = data['contact'].strip()
-
-        if 'email' in data:
-            supplier.email = data['email'].strip().lower() if data['email'] else None
-
-        if 'address' in data:
-            supplier.address = data['address'].strip() if data['address'] else None
+        for field, value in payload.items():
+            setattr(supplier, field, value)
 
         db.session.commit()
-        logger.info(f'Supplier updated: {supplier.name} (ID: {supplier_id})')
+        logger.info('Supplier updated: %s (ID: %s)', supplier.name, supplier_id)
 
         return success_response(f'Supplier Updated successfully!', data=supplier.to_dict())
 
     except Exception as e:
-        logger.error(f'Error in Updating Supplier: {str(e)}')
+        logger.error('Error in Updating Supplier: %s', str(e))
         return error_response(f'Failed to update Supplier!', status_code= 500)
 
+def _hard_delete_supplier(app, supplier_id, supplier_name, product_count, user_id):
+    """
+    Background worker: run the cascade delete off the request thread
+
+    A supplier with thousands of products turns the DELETE into a long
+    cascade; doing it here keeps the HTTP worker free. Needs its own app
+    context (and therefore its own session) - the request's is gone by
+    the time this runs
+    """
+    with app.app_context():
+        try:
+            db.session.execute(delete(Supplier).where(Supplier.id == supplier_id))
+            db.session.commit()
+            # the cascade just removed this supplier's products - purge
+            # the cached lists/dashboards/suggest entries that still
+            # contain them
+            invalidate_products_cache()
+            logger.warning('Supplier deleted: %s (ID: %s)- %s products deleted by user ID %s',
+                           supplier_name, supplier_id, product_count, user_id
+            )
+        except Exception as e:
+            db.session.rollback()
+            logger.error('Background supplier delete failed for ID %s: %s', supplier_id, str(e))
+        finally:
+            db.session.remove()
+
+
 @supplier_bp.route('/<int:supplier_id>', methods=['DELETE'])
 @jwt_required()
 def delete_supplier(supplier_id):
@@ -183,40 +236,46 @@ def delete_supplier(supplier_id):
         supplier_id: Supplier to be deleted
     """
     try:
-        # check if admin
-        current_user_id = int(get_jwt_identity())
-        current_user = User.query.get(current_user_id)
-
-        if current_user.role != 'admin':
-            logger.error(f'Unauthorized access attempt by {current_user_id}'
-                         f'tried to delete {supplier_id}'
+        # check if admin straight from the token claims - the gate needs
+        # no User row at all
+        if get_jwt().get('role') != 'admin':
+            logger.error('Unauthorized access attempt by %s tried to delete %s',
+                         get_jwt_identity(), supplier_id
             )
+            return error_response(f'Admin access required!', status_code= 403)
 
-        # check supplier exists
-        supplier = Supplier.query.get(supplier_id)
+        # check supplier exists (the dynamic .products collection stays
+        # a query - the count below is one COUNT(*), and the delete
+        # cascades DB-side without loading any product rows)
+        supplier = db.session.get(Supplier, supplier_id)
 
         if not supplier:
             return error_response(f'Supplier not found', status_code= 404)
 
         supplier_name = supplier.name
-        product_count = len(supplier.products)
+        product_count = supplier.products.count()
 
         # Warning if supplier has products
         if product_count > 0:
-            logger.warning(f'Deleting supplier with {product_count} products: {supplier_name}')
-
-        db.session.delete(supplier)
-        db.session.commit()
-
-        logger.warning(f'Supplier deleted: {supplier_name} (ID: {supplier_id})'
-                       f'- {product_count} products deleted by {current_user.username}'
+            logger.warning('Deleting supplier with %s products: %s', product_count, supplier_name)
+
+        # hand the cascade to the background pool and answer right away
+        # (202) - with many products the DELETE can run for a while and
+        # there is nothing the client needs from it beyond the counts
+        # already fetched above
+        from config.cloudinary_config import get_upload_pool
+        get_upload_pool().submit(
+            _hard_delete_supplier,
+            current_app._get_current_object(),
+            supplier_id, supplier_name, product_count, get_jwt_identity()
         )
 
-        return success_response(f'Supplier {supplier.name} deleted successfully.'
-                                f'{product_count} associated products also deleted.')
+        return success_response(f'Supplier {supplier_name} deletion scheduled.'
+                                f'{product_count} associated products will also be deleted.',
+                                status_code= 202)
 
     except Exception as e:
         db.session.rollback()
-        logger.error(f'Error in deleting Supplier: {str(e)}')
+        logger.error('Error in deleting Supplier: %s', str(e))
         return error_response('Failed to delete supplier', status_code= 500)
 
@@ -1,21 +1,124 @@
-from flask import Blueprint, request
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask import Blueprint, request, current_app, stream_with_context
+import orjson
+from flask_jwt_extended import jwt_required, get_jwt, get_jwt_identity
+from sqlalchemy import func, select
 from config.database import db
 from config.logging_config import AppLogger
-from models import User, Product, Transaction
+from models import Product, Transaction
+from routes.product_routes import invalidate_products_cache
 from utils import(
             success_response,
             error_response,
-            validate_required_fields,
-            paginate_query
+            clean_fields,
+            as_str,
+            paginate_query,
+            paginate_query_keyset,
+            parse_date
 )
 from datetime import datetime, timedelta
+from types import SimpleNamespace
+import threading
+import time
 
 # create Blueprint
 transaction_bp = Blueprint('transaction', __name__, url_prefix='/api/transactions')
 
 logger = AppLogger.get_logger(__name__)
 
+
+# Stats response cache, keyed on the raw date args. Dashboards poll the
+# default 30-day range far more often than stock moves; a short TTL
+# absorbs the aggregation scan, and the stock endpoints drop the cache
+# after every commit so stale reads last at most one poll
+_stats_cache = {}
+_STATS_TTL = 60.0
+_stats_lock = threading.Lock()
+
+
+def _stats_cached(key, build):
+    """
+    Cached stats payload for key, computed via build() under the fill
+    lock when stale (double-checked so waiters reuse the winner's run)
+    """
+    entry = _stats_cache.get(key)
+    if entry and time.monotonic() - entry[0] < _STATS_TTL:
+        return entry[1]
+    with _stats_lock:
+        entry = _stats_cache.get(key)
+        if entry and time.monotonic() - entry[0] < _STATS_TTL:
+            return entry[1]
+        data = build()
+        _stats_cache[key] = (time.monotonic(), data)
+        return data
+
+
+def _invalidate_stats_cache():
+    _stats_cache.clear()
+
+
+# payload schema for stock movements, compiled once at import: casts
+# and strips in one pass so bad types come back as a 400, not an
+# AttributeError 500 deep in a .strip() chain
+_STOCK_SCHEMA = (
+    ('product_id', True, int),
+    ('quantity', True, int),
+    ('notes', False, as_str),
+)
+
+
+def _token_user():
+    """
+    The acting user reconstructed from the JWT claims - id, username and
+    role were authenticated into the token at login, so no User row (or
+    user-lookup query) is needed per request
+    """
+    claims = get_jwt()
+    return SimpleNamespace(
+        id=int(get_jwt_identity()),
+        username=claims.get('username'),
+        role=claims.get('role'),
+    )
+
+
+def _transaction_row_dict(r):
+    """
+    One projection row tuple -> response dict (Transaction.to_dict shape)
+    """
+    return {
+        'id': r.id,
+        'type': r.type,
+        'quantity': r.quantity,
+        'notes': r.notes,
+        'date': r.date.isoformat() if r.date else None,
+        'product_id': r.product_id,
+        'user_id': r.user_id,
+    }
+
+
+def _transaction_payload(transaction, product, user):
+    """
+    to_dict(include_relations=True) shape built from objects already in
+    memory - touching transaction.product/.user after commit would
+    lazy-load each with its own SELECT
+    """
+    return {
+        'id': transaction.id,
+        'type': transaction.type,
+        'quantity': transaction.quantity,
+        'notes': transaction.notes,
+        'date': transaction.date.isoformat() if transaction.date else None,
+        'product': {
+            'id': product.id,
+            'name': product.name,
+            'sku': product.sku
+        },
+        'user': {
+            'id': user.id,
+            'username': user.username,
+            'role': user.role
+        }
+    }
+
 @transaction_bp.route('', methods=['GET'])
 @jwt_required()
 def get_all_transactions():
@@ -24,7 +127,10 @@ def get_all_transactions():
 
     Query Parameters:
         page: Page number (by default: 1)
-        per_page: items per page (by default: 10)
+        per_page: items per page (by default: 10, max: 100)
+        after_id: Keyset cursor - return rows older than this id and
+                  skip the COUNT/OFFSET work (use the last id of the
+                  previous page)
         type: Filter by type (IN/OUT)
         product_id: Filter by product
         user_id: Filter by user
@@ -36,60 +142,110 @@ def get_all_transactions():
     """
     try:
         page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 10, type=int)
-
-        # build query
-        query = Transaction.query
+        # clamp: an unchecked per_page lets one request materialize the
+        # whole table
+        per_page = min(max(request.args.get('per_page', 10, type=int), 1), 100)
+
+        # column projection (notes included explicitly - it is deferred
+        # on the entity); dicts are built from the row tuples with no
+        # ORM hydration per row
+        query = db.session.query(
+            Transaction.id,
+            Transaction.type,
+            Transaction.quantity,
+            Transaction.notes,
+            Transaction.date,
+            Transaction.product_id,
+            Transaction.user_id,
+        )
 
         # filter by type
         transaction_type = request.args.get('type', '').upper()
         if transaction_type in ['IN', 'OUT']:
-            query = query.filter_by(type= transaction_type)
+            query = query.filter(Transaction.type == transaction_type)
 
         # filter by product
         product_id = request.args.get('product_id',type=int)
         if product_id:
-            query = query.filter_by(product_id = product_id)
+            query = query.filter(Transaction.product_id == product_id)
 
         # filter by user
         user_id = request.args.get('user_id',type=int)
         if user_id:
-            query = query.filter_by(user_id = user_id)
+            query = query.filter(Transaction.user_id == user_id)
 
-        # filter by date range
+        # filter by date range. These were filter_by(...) calls, which
+        # take kwargs only - passing a comparison expression blew up
+        # into the catch-all 500, so date filtering never worked; typed
+        # params also let the date index serve the range
         from_date = request.args.get('from_date')
         if from_date:
-            query = query.filter_by(Transaction.date >= from_date)
+            from_date = parse_date(from_date)
+            if not from_date:
+                return error_response('Invalid from_date format. Use YYYY-MM-DD', status_code=400)
+            query = query.filter(Transaction.date >= from_date)
 
         to_date = request.args.get('to_date')
         if to_date:
-            query = query.filter_by(Transaction.date <= to_date)
+            to_date = parse_date(to_date)
+            if not to_date:
+                return error_response('Invalid to_date format. Use YYYY-MM-DD', status_code=400)
+            query = query.filter(Transaction.date <= to_date)
 
         # order by date
         query= query.order_by(Transaction.date.desc())
 
+        # ?stream=1: emit the whole filtered set off a batched cursor,
+        # one row encoded at a time - memory stays O(batch) when an
+        # admin exports everything
+        if request.args.get('stream') == '1':
+            def generate():
+                yield b'{"success":true,"message":"Transactions retrieved successfully","data":{"transactions":['
+                first = True
+                for r in query.yield_per(500):
+                    doc = orjson.dumps(_transaction_row_dict(r))
+                    yield doc if first else b',' + doc
+                    first = False
+                yield b']}}'
+
+            logger.info('Transactions streamed')
+            return current_app.response_class(
+                stream_with_context(generate()), mimetype='application/json'
+            )
+
+        # keyset mode: page on id (monotonic, matching date order) - no
+        # COUNT and no OFFSET scan, so deep history pages stay cheap
+        after_id = request.args.get('after_id', type=int)
+        if after_id is not None:
+            result = paginate_query_keyset(query, Transaction.id,
+                                           cursor_id=after_id, per_page=per_page)
+            return success_response(f'Transactions retrieved successfully',
+                                    data={
+                                        'transactions': [_transaction_row_dict(r) for r in result['items']],
+                                        'pagination': {
+                                            'per_page': per_page,
+                                            'has_next': result['pagination']['has_next'],
+                                            'next_after_id': result['pagination']['next_cursor']
+                                        }
+                                    }
+            )
+
         # paginate
         result = paginate_query(query, page, per_page)
 
-        # Include relations
-        transactions_data = [t.to_dict() for t in result['items']]
+        # same shape as Transaction.to_dict()
+        transactions_data = [_transaction_row_dict(r) for r in result['items']]
 
-        logger.info(f'Transactions fetched: Page={page}, total= {result["total"]}')
+        logger.info('Transactions fetched: Page=%s, total= %s', page, result['pagination']['total'])
 
         return success_response(f'Transactions retrieved successfully',
                                 data={
                                     'transactions': transactions_data,
-                                    'pagination':{
-                                        'page': result['pages'],
-                                        'per_page':result['per_page'],
-                                        'current_page':result['current_page'],
-                                        'has_next': result['has_next'],
-                                        'has_prev': result['has_prev']
-                                    }
+                                    'pagination': result['pagination']
                                 }
         )
     except Exception as e:
-        logger.error(f'Error in getting transactions: {str(e)}')
+        logger.error('Error in getting transactions: %s', str(e))
         return error_response(f'Failed to fetch transactions', status_code=500)
 
 
@@ -106,59 +262,153 @@ def stock_in():
     }
     """
     try:
-        data = request.get_json()
-
-        # validate required fields
-        required_fields= ['product_id', 'quantity']
-        is_valid, missing = validate_required_fields(data, required_fields)
-
-        if not is_valid:
-            return error_response(f'Missing required fields: {missing}', status_code= 400)
-
-        # get current user
-        current_user_id = int(get_jwt_identity())
-        current_user = User.query.get(current_user_id)
-
-        # get product
-        product = Product.query.get(data['product_id'])
+        payload, errors = clean_fields(request.get_json(), _STOCK_SCHEMA)
+        if errors:
+            return error_response(f'Invalid fields: {errors}', status_code= 400)
+
+        # acting user comes straight from the token claims - no lookup
+        user = _token_user()
+
+        # get product with a row lock: without FOR UPDATE two
+        # concurrent requests can read the same stock level and both
+        # commit against it
+        product = db.session.execute(
+            select(Product).where(Product.id == payload['product_id']).with_for_update()
+        ).scalar_one_or_none()
         if not product:
             return error_response('Product not found', status_code= 404)
 
-        # get quantity
-        quantity = int(data['quantity'])
         # validate quantity
+        quantity = payload['quantity']
         if quantity <= 0:
             return error_response('Quantity must be positive', status_code= 400)
 
-        notes = data.get('notes', '').strip() or None
-
-        # create transaction using static method
-        transaction = Transaction.create_stock_in(product, quantity, current_user, notes)
+        notes = payload['notes']
+
+        # build the row inline - quantity was just validated, so the
+        # static helper's re-check and extra call frame buy nothing on
+        # this per-request path (the batch route keeps the helper)
+        transaction = Transaction(
+            product_id=product.id,
+            user_id=user.id,
+            type='IN',
+            quantity=quantity,
+            notes=notes
+        )
+        product.quantity += quantity
 
         db.session.add(transaction)
         db.session.commit()
+        _invalidate_stats_cache()
+        # quantities changed - the product list/dashboard/suggest
+        # caches hold the old values
+        invalidate_products_cache()
 
         logger.info(
-            f'STOCK IN | Product: {product.name} (ID: {product.id}) | '
-            f'Qty: ++{quantity} | New Stock: {product.quantity} | '
-            f'User: {current_user.username} | Notes: {notes if notes else "N/A"}'
+            'STOCK IN | Product: %s (ID: %s) | Qty: ++%s | New Stock: %s | '
+            'User: %s | Notes: %s',
+            product.name, product.id, quantity, product.quantity,
+            user.username, notes if notes else 'N/A'
         )
         return success_response(
             f'Stock IN successful',
             data={
-                'transaction': transaction.to_dict(include_relations=True),
+                'transaction': _transaction_payload(transaction, product, user),
                 'product': product.to_dict()
             },
             status_code= 201
         )
     except ValueError as e:
-        logger.error(f'Stock IN validation error: {str(e)}')
+        logger.error('Stock IN validation error: %s', str(e))
         return error_response(str(e), status_code= 400)
     except Exception as e:
         db.session.rollback()
-        logger.error(f'Error in StockIN: {str(e)}')
+        logger.error('Error in StockIN: %s', str(e))
         return error_response('Stock In failed', status_code= 500)
 
+@transaction_bp.route('/stock-in/batch', methods=['POST'])
+@jwt_required()
+def stock_in_batch():
+    """
+    Batch Stock IN - receive many line items in one transaction
+
+    One request, one commit: posting a 500-line purchase order through
+    /stock-in would pay 500 commits (and fsyncs); here every line shares
+    a single SELECT ... IN for the products and a single commit
+
+    Request Body: {
+        "items": [
+            {"product_id": 1, "quantity": 100, "notes": "PO-123" (optional)},
+            ...
+        ]
+    }
+    """
+    try:
+        data = request.get_json()
+
+        items = data.get('items') if data else None
+        if not items or not isinstance(items, list):
+            return error_response('items must be a non-empty list', status_code= 400)
+
+        lines = []
+        for item in items:
+            line, errors = clean_fields(item, _STOCK_SCHEMA)
+            if errors:
+                return error_response(f'Invalid fields in item: {errors}', status_code= 400)
+            lines.append(line)
+
+        # fetch all products in one locked SELECT ... WHERE id IN (...)
+        # instead of one round trip per line; FOR UPDATE keeps the
+        # quantities stable while we apply the whole batch
+        user = _token_user()
+
+        ids = {line['product_id'] for line in lines}
+        products = {
+            p.id: p
+            for p in Product.query.filter(Product.id.in_(ids)).with_for_update().all()
+        }
+
+        # fail fast before mutating anything
+        missing_ids = ids - products.keys()
+        if missing_ids:
+            return error_response(f'Products not found: {sorted(missing_ids)}', status_code= 404)
+
+        transactions = []
+        for line in lines:
+            if line['quantity'] <= 0:
+                return error_response('Quantity must be positive', status_code= 400)
+            transactions.append(Transaction.create_stock_in(
+                products[line['product_id']], line['quantity'], user, line['notes']
+            ))
+
+        db.session.add_all(transactions)
+        db.session.commit()
+        _invalidate_stats_cache()
+        # quantities changed - the product list/dashboard/suggest
+        # caches hold the old values
+        invalidate_products_cache()
+
+        logger.info(
+            'BATCH STOCK IN | %s lines | %s products | User: %s',
+            len(transactions), len(products), user.username
+        )
+        return success_response(
+            f'Batch stock IN successful ({len(transactions)} items)',
+            data={
+                'transactions': [t.to_dict() for t in transactions],
+                'products': [p.to_dict() for p in products.values()]
+            },
+            status_code= 201
+        )
+    except ValueError as e:
+        db.session.rollback()
+        logger.error('Batch stock IN validation error: %s', str(e))
+        return error_response(str(e), status_code= 400)
+    except Exception as e:
+        db.session.rollback()
+        logger.error('Error in batch StockIN: %s', str(e))
+        return error_response('Batch stock In failed', status_code= 500)
+
 @transaction_bp.route('/stock-out', methods=['POST'])
 @jwt_required()
 def stock_out():
@@ -172,66 +422,82 @@ def stock_out():
         }
     """
     try:
-        data = request.get_json()
-
-        # validate required fields
-        required_fields = ['product_id', 'quantity']
-        is_valid, missing = validate_required_fields(data, required_fields)
-
-        if not is_valid:
-            return error_response(f'Missing required fields: {missing}', status_code= 400)
-
-        # get current user
-        current_user_id = int(get_jwt_identity())
-        current_user = User.query.get(current_user_id)
-
-        # Get product
-        product = Product.query.get(data['product_id'])
+        payload, errors = clean_fields(request.get_json(), _STOCK_SCHEMA)
+        if errors:
+            return error_response(f'Invalid fields: {errors}', status_code= 400)
+
+        # acting user comes straight from the token claims - no lookup
+        user = _token_user()
+
+        # Get product with a row lock - two concurrent stock-outs could
+        # otherwise both pass the availability check and oversell
+        product = db.session.execute(
+            select(Product).where(Product.id == payload['product_id']).with_for_update()
+        ).scalar_one_or_none()
         if not product:
             return error_response('Product not found', status_code= 404)
 
-        quantity = int(data['quantity'])
-        notes = data.get('notes', '').strip() or None
-
+        quantity = payload['quantity']
+        notes = payload['notes']
 
         # validate quantity
         if quantity <= 0:
             return error_response('Quantity must be positive', status_code= 400)
 
-        # create transaction using static method
-        transaction = Transaction.create_stock_out(product, quantity,current_user, notes)
+        # stock check + row built inline instead of through the static
+        # helper - same validation, one call frame less per request
+        if product.quantity < quantity:
+            return error_response(
+                f'Insufficient stock. Available: {product.quantity}, Requested: {quantity}',
+                status_code= 400
+            )
+
+        transaction = Transaction(
+            product_id=product.id,
+            user_id=user.id,
+            type='OUT',
+            quantity=quantity,
+            notes=notes
+        )
+        product.quantity -= quantity
 
         db.session.add(transaction)
         db.session.commit()
+        _invalidate_stats_cache()
+        # quantities changed - the product list/dashboard/suggest
+        # caches hold the old values
+        invalidate_products_cache()
 
         # log to transaction logger
         logger.info(
-            f'STOCK OUT | Product: {product.name} (ID: {product.id}) | '
-            f'Qty: --{quantity} | New Stock: {product.quantity} | '
-            f'User: {current_user.username} | Notes: {notes if notes else "N/A"}'
+            'STOCK OUT | Product: %s (ID: %s) | Qty: --%s | New Stock: %s | '
+            'User: %s | Notes: %s',
+            product.name, product.id, quantity, product.quantity,
+            user.username, notes if notes else 'N/A'
         )
 
         # Low stock warning if
         if product.quantity <= 10:
             logger.warning(
-                f'LOW STOCK: {product.name} - Only {product.quantity} units remaining'
+                'LOW STOCK: %s - Only %s units remaining',
+                product.name, product.quantity
             )
 
         return success_response(
             'Stock OUT successful',
             data= {
-                'transaction': transaction.to_dict(include_relations=True),
+                'transaction': _transaction_payload(transaction, product, user),
                 'product': product.to_dict(),
                 'low_stock_warning': product.quantity <= 10
             },
             status_code= 201
         )
     except ValueError as e:
-        logger.error(f'Stock OUT validation error: {str(e)}')
+        logger.error('Stock OUT validation error: %s', str(e))
         return error_response(str(e), status_code= 400)
     except Exception as e:
         db.session.rollback()
-        logger.error(f'Stock OUT error: {str(e)}')
+        logger.error('Stock OUT error: %s', str(e))
         return error_response('Stock out Failed', status_code= 500)
 
 @transaction_bp.route('/stats', methods=['GET'])
@@ -245,48 +511,55 @@ def get_transaction_stats():
         to_date: End date (YYYY-MM-DD)
     """
     try:
-        # Date range (Default last 30 days)
-        from_date = request.args.get('from_date')
-        to_date = request.args.get('to_date')
-
-        if not from_date:
-            from_date = datetime.now() - timedelta(days=30)
-        if not to_date:
-            to_date = datetime.now()
-
-        # Query Transaction in date range
-        transactions = Transaction.query.filter(
-            Transaction.date >= from_date,
-            Transaction.date <= to_date
-        ).all()
-
-        # Calculate Stats
-        stock_in_count = sum(1 for t in transactions if t.type == 'IN')
-        stock_out_count = sum(1 for t in transactions if t.type == 'OUT')
-        stock_in_quantity = sum(t.quantity for t in transactions if t.type == 'IN')
-        stock_out_quantity = sum(t.quantity for t in transactions if t.type == 'OUT')
-        
-        stats = {
-            'date_range': {
-                'from': str(from_date),
-                'to': str(to_date)
-            },
-            'total_transactions': len(transactions),
-            'stock_in':{
-                'count': stock_in_count,
-                'quantity': stock_in_quantity
-            },
-            'stock_out': {
-                'count': stock_out_count,
-                'quantity': stock_out_quantity
+        # cache key is the raw args: same dashboard range -> same entry
+        cache_key = (request.args.get('from_date'), request.args.get('to_date'))
+
+        def build():
+            from_date, to_date = cache_key
+
+            # Date range (Default last 30 days)
+            if not from_date:
+                from_date = datetime.now() - timedelta(days=30)
+            if not to_date:
+                to_date = datetime.now()
+
+            # aggregate in SQL: one GROUP BY round trip instead of pulling
+            # every row over the wire and summing in four Python passes
+            rows = db.session.query(
+                Transaction.type,
+                func.count().label('count'),
+                func.coalesce(func.sum(Transaction.quantity), 0).label('quantity'),
+            ).filter(
+                Transaction.date >= from_date,
+                Transaction.date <= to_date
+            ).group_by(Transaction.type).all()
+
+            by_type = {r.type: r for r in rows}
+            stock_in = by_type.get('IN')
+            stock_out = by_type.get('OUT')
+
+            logger.info('Transaction Stats computed between %s to %s', from_date, to_date)
+            return {
+                'date_range': {
+                    'from': str(from_date),
+                    'to': str(to_date)
+                },
+                'total_transactions': sum(r.count for r in rows),
+                'stock_in':{
+                    'count': stock_in.count if stock_in else 0,
+                    'quantity': int(stock_in.quantity) if stock_in else 0
+                },
+                'stock_out': {
+                    'count': stock_out.count if stock_out else 0,
+                    'quantity': int(stock_out.quantity) if stock_out else 0
+                }
             }
-        }
 
-        logger.info(f'Transaction Stats fetched between {from_date} to {to_date}')
+        stats = _stats_cached(cache_key, build)
         return success_response('Transaction Statistics', data= stats)
 
     except Exception as e:
-        logger.error(f'Error in Transaction stats: {str(e)}')
+        logger.error('Error in Transaction stats: %s', str(e))
         return error_response('Failed to fetch transaction stats', status_code= 500)
 
 
@@ -1,6 +1,12 @@
 from app import app
 import os
 
+# NOTE: app.run() below is the single-threaded development server. In
+# production serve through gunicorn so requests don't queue behind one
+# worker (threads share the tuned SQLAlchemy pool in config/database.py):
+#
+#   gunicorn -w $(nproc) -k gthread --threads 8 -b 0.0.0.0:5000 app:app
+
 if __name__ == "__main__":
     # Get configuration from environment
     debug_mode = os.getenv('FLASK_ENV', 'production') == 'development'
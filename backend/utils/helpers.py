@@ -1,14 +1,23 @@
-from flask import jsonify
-from datetime import datetime
+from flask import Response, request
+import orjson
+from datetime import date
 from config.logging_config import AppLogger
 
 logger = AppLogger.get_logger(__name__)
 
+# encoder options mirror the app-wide OrjsonProvider; default=str picks
+# up the stray Decimal/date the fast paths don't cover
+_JSON_OPTION = orjson.OPT_NON_STR_KEYS
+
+
+def _json_bytes(payload):
+    return orjson.dumps(payload, default=str, option=_JSON_OPTION)
+
 def success_response(message, data=None, status_code=200):
     """
     Standard Success response format
-    Returns: 
-        JSON response 
+    Returns:
+        JSON response
     """
 
     response = {
@@ -19,12 +28,16 @@ def success_response(message, data=None, status_code=200):
     if data is not None:
         response['data'] = data
 
-    return jsonify(response), status_code
+    # build the Response directly: jsonify re-resolves the app, encoder
+    # and headers on every call, and these two helpers sit on every API
+    # return; orjson emits bytes, skipping the provider's str round trip
+    return Response(_json_bytes(response),
+                    status=status_code, mimetype='application/json')
 
 def error_response(message, errors=None, status_code=400):
     """
     Standard error response format
-    Returns: 
+    Returns:
         JSON response
     """
     response = {
@@ -35,8 +48,21 @@ def error_response(message, errors=None, status_code=400):
     if errors is not None:
         response['errors'] = errors
 
-    return jsonify(response)
+    # the old jsonify return dropped status_code entirely, so every
+    # error went out as HTTP 200; the direct Response carries it
+    return Response(_json_bytes(response),
+                    status=status_code, mimetype='application/json')
     
+def json_body():
+    """
+    Parsed JSON body of the current request, or {} when absent/invalid
+    silent=True skips the content-type probe error path and never falls
+    back to form parsing; Flask caches the parse so repeated calls in
+    one request (validators, error paths) are free
+    """
+    return request.get_json(silent=True, cache=True) or {}
+
+
 def validate_required_fields(data, required_fields):
     """
     Validate if all required fields are present in the data
@@ -51,19 +77,107 @@ def validate_required_fields(data, required_fields):
     """
     if not data:
         return False, required_fields
-    
-    missing_fields = []
-    
-    for field in required_fields:
-        if field not in data or data[field] is None or data[field] == '':
-            missing_fields.append(field)
 
-    is_valid = len(missing_fields) == 0
+    # one .get per field covers absent, None and empty-string in a
+    # single C-level tuple membership test (0 stays a valid value)
+    missing_fields = [f for f in required_fields if data.get(f) in (None, '')]
 
-    if not is_valid:
-        pass
+    return not missing_fields, missing_fields
 
-    return is_valid, missing_fields
+
+def make_validator(required_fields):
+    """
+    Precompile a required-field check for a fixed schema
+
+    Routes whose payload shape never changes can build the validator
+    once at import time instead of passing the field list per request;
+    the closure holds the frozenset and returns the same
+    (is_valid, missing) pair as validate_required_fields
+
+    Example:
+        _validate_product = make_validator(['name', 'price', 'quantity'])
+        is_valid, missing = _validate_product(data)
+    """
+    required = frozenset(required_fields)
+
+    def _validate(data):
+        if not data:
+            return False, sorted(required)
+        missing = [f for f in required if data.get(f) in (None, '')]
+        return not missing, missing
+
+    return _validate
+
+
+def as_str(value):
+    """
+    Schema caster: stripped string, rejecting non-string input
+    """
+    if not isinstance(value, str):
+        raise TypeError('expected a string')
+    return value.strip()
+
+
+def as_lower_str(value):
+    """
+    Schema caster: stripped, lowercased string (emails, usernames)
+    """
+    return as_str(value).lower()
+
+
+def clean_fields(data, schema, partial=False):
+    """
+    Validate and normalize a JSON payload against a precompiled schema
+
+    The per-route chains of data['x'].strip() crash with an
+    AttributeError (-> catch-all 500) whenever a client sends a
+    non-string; this walks the schema in one pass and reports every bad
+    field at once, so routes can fail fast with a 400
+
+    Args:
+        data: dict from request.get_json()
+        schema: tuple of (field, required, caster) entries, built once
+                at import time next to the route; caster is as_str,
+                as_lower_str, int, ...
+        partial: if True (update routes), fields absent from data are
+                 skipped instead of defaulted
+    Returns:
+        (payload, errors): payload maps field -> normalized value
+        (absent/empty optional fields -> None); errors is a list of
+        messages, empty when the payload is valid
+    """
+    data = data or {}
+    payload = {}
+    errors = []
+
+    for field, required, caster in schema:
+        if partial and field not in data:
+            continue
+
+        value = data.get(field)
+        if value is None or value == '':
+            if required:
+                errors.append(f'{field} is required')
+            else:
+                payload[field] = None
+            continue
+
+        try:
+            value = caster(value)
+        except (TypeError, ValueError):
+            errors.append(f'{field} is invalid')
+            continue
+
+        # strings that collapse to empty count as missing
+        if value == '':
+            if required:
+                errors.append(f'{field} is required')
+            else:
+                payload[field] = None
+        else:
+            payload[field] = value
+
+    return payload, errors
 
 
 def parse_date(date_string):
@@ -72,28 +186,54 @@ def parse_date(date_string):
     Args:
         date_Strign: Date in format 'YYYY-MM-DD'
 
-    Returns: 
+    Returns:
         date object or None if invalid
 
     """
+    # fromisoformat is a C-level positional parse; strptime re-reads the
+    # format string and goes through a regex on every call
     try:
-        return datetime.strptime(date_string, '%Y-%m-%d').date()
+        return date.fromisoformat(date_string)
     except (ValueError, TypeError) as e:
-        logger.error(f"Error in parsing date: {str(e)}")
+        logger.error('Error in parsing date: %s', e)
         return None
     
 
-def paginate_query(query, page=1, per_page=10):
+def paginate_query(query, page=1, per_page=10, count=True):
     """
     Helper for pagination
     Args:
         query: SQLAlchemy query objetc
         page: Page number (default: 1)
         per_page: Items per page (default: 10)
+        count: if False, skip the COUNT(*) query entirely - has_next is
+               derived from fetching one extra row, and total/pages come
+               back as None (callers show next/prev controls, not a page
+               counter). On big tables the COUNT is often costlier than
+               the page fetch itself
     Returns:
-        dict: Paginated results with metadata
+        dict: {'items': [...], 'pagination': {...}} - the pagination
+        metadata comes pre-assembled so every list route can embed it
+        directly instead of rebuilding the same dict per request
     """
     try:
+        if not count:
+            page = max(page, 1)
+            rows = query.limit(per_page + 1)\
+                    .offset((page - 1) * per_page).all()
+            has_next = len(rows) > per_page
+            return {
+                'items': rows[:per_page],
+                'pagination': {
+                    'total': None,
+                    'pages': None,
+                    'current_page': page,
+                    'per_page': per_page,
+                    'has_next': has_next,
+                    'has_prev': page > 1
+                }
+            }
+
         pagination = query.paginate(
             page = page,
             per_page = per_page,
@@ -102,21 +242,63 @@ def paginate_query(query, page=1, per_page=10):
 
         return {
             'items': pagination.items,
-            'total': pagination.total,
-            'pages': pagination.pages,
-            'current_page': pagination.page,
-            'per_page': per_page,
-            'has_next': pagination.has_next,
-            'has_prev': pagination.has_prev
+            'pagination': {
+                'total': pagination.total,
+                'pages': pagination.pages,
+                'current_page': pagination.page,
+                'per_page': per_page,
+                'has_next': pagination.has_next,
+                'has_prev': pagination.has_prev
+            }
         }
     except Exception as e:
-        logger.error(f'Pagination error: {str(e)}')
+        logger.error('Pagination error: %s', e)
         return {
             'items': [],
-            'total':0,
-            'pages':0,
-            'current_page':1,
+            'pagination': {
+                'total': 0,
+                'pages': 0,
+                'current_page': 1,
+                'per_page': per_page,
+                'has_next': False,
+                'has_prev': False
+            }
+        }
+
+
+def paginate_query_keyset(query, id_col, cursor_id=None, per_page=10):
+    """
+    Keyset (seek) pagination on an indexed id column
+
+    LIMIT/OFFSET discards page*per_page rows before returning anything,
+    so deep pages degrade linearly and every page pays a COUNT(*).
+    Seeking on the id index costs the same for page 1 and page 1000:
+    rows come back newest-first, the client passes the last id it saw
+    as cursor_id, and has_next falls out of fetching one extra row
+
+    Args:
+        query: SQLAlchemy query, already filtered
+        id_col: Indexed autoincrement column to seek on (e.g. Product.id)
+        cursor_id: Last id the client saw, or None for the first page
+        per_page: Items per page (default: 10)
+    Returns:
+        dict: {'items': [...], 'pagination': {'per_page', 'has_next',
+        'next_cursor'}} - no total/pages, callers using this path show
+        a load-more control instead of numbered pages
+    """
+    if cursor_id is not None:
+        query = query.filter(id_col < cursor_id)
+
+    rows = query.order_by(None).order_by(id_col.desc())\
+            .limit(per_page + 1).all()
+    has_next = len(rows) > per_page
+    rows = rows[:per_page]
+
+    return {
+        'items': rows,
+        'pagination': {
             'per_page': per_page,
-            'has_next': False,
-            'has_prev': False
-        }
\ No newline at end of file
+            'has_next': has_next,
+            'next_cursor': getattr(rows[-1], id_col.key) if has_next else None
+        }
+    }
\ No newline at end of file
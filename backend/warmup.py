@@ -0,0 +1,30 @@
+"""
+Deploy-time warmup script
+
+First import of a module pays the .py -> .pyc compile cost; run this
+once after a deploy (before gunicorn workers start serving) so every
+module is byte-compiled and __pycache__ is populated:
+
+    python -m compileall -q -j 0 .
+    python warmup.py
+"""
+
+import importlib
+
+from app import create_app
+from routes import _LAZY
+
+
+def warm():
+    app = create_app()
+
+    # force-import every blueprint module the lazy loader would defer
+    for module_name in _LAZY.values():
+        importlib.import_module(module_name)
+
+    return app
+
+
+if __name__ == "__main__":
+    warm()
+    print("Warmup complete: app created and all route modules imported")